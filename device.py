@@ -38,9 +38,9 @@ parser.add_argument("--no-simulation", action="store_false", dest="simulation",
 
 # --- State Variables ---
 good = meh = bad = 0
-smiley_override_time = 0.0
+smiley_override_time = float("-inf")  # time.monotonic() of the last vote
 events = []
-upload_failed_time = 0
+upload_failed_time = float("-inf")  # time.monotonic() of the last failed upload
 UPLOAD_FAILED_DURATION = 2.0
 SMILEY_EMA_ALPHA = 0.20
 smiley_ema = 0.0
@@ -55,11 +55,15 @@ SERVER_URL = "http://127.0.0.1:5000/upload"
 def avg_sensor_values():
     """Calculate averages of sensor data."""
     try:
-        if not sensor_runner.sensor_buffer:
+        # Snapshot first: the sensor thread keeps appending, and iterating the live deque
+        # while it grows raises "deque mutated during iteration". tuple() copies in one C call.
+        buf = tuple(sensor_runner.sensor_buffer)
+        if not buf:
             return {"temp": 0, "humidity": 0, "co2": 0}
-        temp = round(sum(s.temp for s in sensor_runner.sensor_buffer) / len(sensor_runner.sensor_buffer), 1)
-        humidity = round(sum(s.humidity for s in sensor_runner.sensor_buffer) / len(sensor_runner.sensor_buffer), 1)
-        co2 = round(sum(s.co2 for s in sensor_runner.sensor_buffer) / len(sensor_runner.sensor_buffer), 0)
+        n = len(buf)
+        temp = round(sum(s.temp for s in buf) / n, 1)
+        humidity = round(sum(s.humidity for s in buf) / n, 1)
+        co2 = round(sum(s.co2 for s in buf) / n, 0)
         return {"temp": temp, "humidity": humidity, "co2": co2}
     except Exception as e:
         _LOG.exception("Error computing average sensor values: %s", e)
@@ -94,9 +98,9 @@ def upload_to_server(avg_sensor, events_list):
             _LOG.info("Upload successful: %s", response.json())
         else:
             _LOG.warning("Upload failed with status: %s", response.text)
-            upload_failed_time = time.time()
+            upload_failed_time = time.monotonic()
     except Exception as e:
-        upload_failed_time = time.time()
+        upload_failed_time = time.monotonic()
         _LOG.exception("Upload error: %s", e)
 
 
@@ -110,7 +114,7 @@ def on_vote(kind: str):
         meh += 1
     elif kind == "bad":
         bad += 1
-    smiley_override_time = ts
+    smiley_override_time = time.monotonic()
     value = {"good": 1.0, "meh": 0.0, "bad": -1.0}.get(kind, 0.0)
     smiley_ema = SMILEY_EMA_ALPHA * value + (1 - SMILEY_EMA_ALPHA) * smiley_ema
     events.append({"kind": kind, "timestamp": ts})
@@ -119,8 +123,8 @@ def on_vote(kind: str):
 
 def get_latest_sensor():
     """Fetch the latest sensor sample from the sensor buffer."""
-    if sensor_runner.sensor_buffer:
-        latest = sensor_runner.sensor_buffer[-1]
+    latest = sensor_runner.latest()
+    if latest is not None:
         _LOG.info("Latest sensor sample: %s", latest)
         return latest
     else:
@@ -9,16 +9,19 @@ Provides:
 - SensorRunner(simulation_mode=False)
 - .start(interval=2.0)
 - .stop()
-- .sensor_buffer: list of SensorSample objects (temp, humidity, co2, ts)
+- .sensor_buffer: deque of SensorSample objects (temp, humidity, co2, ts), capped at max_buffer
+- .latest(): most recent SensorSample, or None
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 import time
+import struct
 import threading
 import random
 import logging
-from typing import List, Optional
+from collections import deque
+from typing import Deque, List, Optional
 
 try:
     from smbus2 import SMBus  # type: ignore
@@ -38,6 +41,9 @@ COMMAND_READ_MEASUREMENT = [0xEC, 0x05]   # read measurement
 COMMAND_STOP_MEASUREMENT = [0x3F, 0x86]   # stop periodic measurements
 COMMAND_SOFT_RESET = [0x36, 0x82]         # soft reset
 
+# read_measurement response: CO2, T, RH as big-endian u16 words, each followed by a CRC byte
+_MEASUREMENT = struct.Struct(">HxHxHx")
+
 
 @dataclass
 class SensorSample:
@@ -84,9 +90,7 @@ def _read_measurement(bus: SMBus, address: int) -> tuple[int, float, float]:
         if calculate_crc(word_bytes) != crc:
             raise ValueError("CRC mismatch on measurement field")
 
-    co2 = int.from_bytes(bytes(data[0:2]), "big")
-    temp_raw = int.from_bytes(bytes(data[3:5]), "big")
-    hum_raw = int.from_bytes(bytes(data[6:8]), "big")
+    co2, temp_raw, hum_raw = _MEASUREMENT.unpack_from(bytes(data))
 
     temp = -45 + (175 * temp_raw) / 65535.0
     humidity = 100 * hum_raw / 65535.0
@@ -98,8 +102,12 @@ class SensorRunner:
         self.simulation_mode = simulation_mode
         self.max_buffer = max(10, int(max_buffer))
 
-        self.sensor_buffer: List[SensorSample] = []
-        self._lock = threading.Lock()
+        # Single writer (the sensor thread): deque.append() is atomic under the GIL and
+        # maxlen drops the oldest sample in O(1), so the list trimming is gone.
+        # Readers must not iterate the live deque (the writer may append meanwhile and the
+        # iterator raises RuntimeError): take tuple(sensor_buffer) first or use latest().
+        self.sensor_buffer: Deque[SensorSample] = deque(maxlen=self.max_buffer)
+        self._latest: Optional[SensorSample] = None  # republished by plain assignment
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._interval = 2.0
@@ -128,10 +136,12 @@ class SensorRunner:
 
     def _append(self, co2: int, temp: float, humidity: float):
         s = SensorSample(co2=int(co2), temp=float(temp), humidity=float(humidity), ts=time.time())
-        with self._lock:
-            self.sensor_buffer.append(s)
-            if len(self.sensor_buffer) > self.max_buffer:
-                del self.sensor_buffer[0: len(self.sensor_buffer) - self.max_buffer]
+        self.sensor_buffer.append(s)
+        self._latest = s
+
+    def latest(self) -> Optional[SensorSample]:
+        """Most recent sample, or None if nothing was measured yet."""
+        return self._latest
 
     def _sim_step(self) -> tuple[int, float, float]:
         # gentle random walk
@@ -141,14 +151,26 @@ class SensorRunner:
         self._sim_hum = max(0.0, min(100.0, self._sim_hum))
         return self._sim_co2, self._sim_temp, self._sim_hum
 
+    def _wait_next(self, next_tick: float) -> float:
+        """Sleep until the next slot on a fixed monotonic grid and return its deadline."""
+        next_tick += self._interval
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # fell behind (slow bus, CRC retries): resync instead of bursting to catch up
+            next_tick = time.monotonic()
+        return next_tick
+
     def _loop(self):
         if self.simulation_mode or not SMBUS2_AVAILABLE:
             if not SMBUS2_AVAILABLE and not self.simulation_mode:
                 _LOG.warning("smbus2 not available; falling back to simulation mode")
+            next_tick = time.monotonic()
             while self._running:
                 co2, temp, hum = self._sim_step()
                 self._append(co2, temp, hum)
-                time.sleep(self._interval)
+                next_tick = self._wait_next(next_tick)
             return
 
         # Hardware mode
@@ -162,6 +184,7 @@ class SensorRunner:
                 # datasheet recommends waiting for first measurement; keep it modest
                 time.sleep(5.0)
 
+                next_tick = time.monotonic()
                 while self._running:
                     try:
                         if _is_data_ready(bus, SCD41_I2C_ADDR):
@@ -172,7 +195,7 @@ class SensorRunner:
                     except Exception as e:
                         _LOG.warning("SCD41 read failed: %s", e)
 
-                    time.sleep(self._interval)
+                    next_tick = self._wait_next(next_tick)
 
                 # stop periodic
                 try:
@@ -182,7 +205,8 @@ class SensorRunner:
         except Exception as e:
             _LOG.exception("Fatal error in SensorRunner hardware loop: %s", e)
             # fallback: keep running in simulation so UI/upload still works
+            next_tick = time.monotonic()
             while self._running:
                 co2, temp, hum = self._sim_step()
                 self._append(co2, temp, hum)
-                time.sleep(self._interval)
\ No newline at end of file
+                next_tick = self._wait_next(next_tick)
\ No newline at end of file
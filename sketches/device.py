@@ -42,6 +42,8 @@ parser.add_argument("--interval", "-i", type=float, default=2.0, help="Sensor Po
 parser.add_argument("--use-scd", action="store_true", help="SCD4x (SCD40/SCD41) verwenden, falls vorhanden")
 parser.add_argument("--use-bme", action="store_true", help="BME280 als Temperaturquelle verwenden, falls vorhanden")
 parser.add_argument("--use-mic", action="store_true", help="Enable microphone (ICS43434) reading if available")
+parser.add_argument("--int-gpio", type=int, default=None,
+                    help="BCM-Pin am CCS811 nINT: auf Data-Ready warten statt zeitgesteuert pollen")
 
 # =========================================================
 # ================ DATENSTRUKTUREN ========================
@@ -52,11 +54,11 @@ upload_counter = 0
 
 # Smiley / Override
 current_smiley_kind = None
-smiley_override_time = 0.0
+smiley_override_time = float("-inf")  # time.monotonic() of the last vote (ui.run compares against monotonic)
 SMILEY_OVERRIDE_DURATION = 3
 
 # Upload failure indicator
-upload_failed_time = 0
+upload_failed_time = float("-inf")  # time.monotonic() of the last failed upload
 UPLOAD_FAILED_DURATION = 2.0
 
 # SMILEY persistence
@@ -103,7 +105,7 @@ load_smiley_state()
 ROTATION_ORDER = ["good", "meh", "bad"]
 ROTATION_INTERVAL = 1.5
 _rotation_idx = 0
-_rotation_last = time.time()
+_rotation_last = time.monotonic()
 
 def pct_round(good: int, meh: int, bad: int) -> Tuple[int,int,int]:
     total = good + meh + bad
@@ -134,7 +136,7 @@ def calculate_avg_smiley(good: int, meh: int, bad: int):
     """
     global _rotation_idx, _rotation_last
     pct_good, pct_meh, pct_bad = pct_round(good, meh, bad)
-    now = time.time()
+    now = time.monotonic()
     if now - _rotation_last >= ROTATION_INTERVAL:
         _rotation_idx = (_rotation_idx + 1) % len(ROTATION_ORDER)
         _rotation_last = now
@@ -171,10 +173,10 @@ def upload_to_server(avg_sensor, events_list):
             _LOG.info("✅ Upload erfolgreich: %s", r.json())
         else:
             _LOG.warning("❌ Fehler beim Upload: Status %s | %s", r.status_code, r.text)
-            upload_failed_time = time.time()
+            upload_failed_time = time.monotonic()
     except Exception as e:
         _LOG.warning("⚠️ Upload fehlgeschlagen: %s", e)
-        upload_failed_time = time.time()
+        upload_failed_time = time.monotonic()
 
 def upload_cycle():
     global events, upload_counter, upload_history
@@ -238,7 +240,7 @@ def on_vote(kind: str):
     else:
         bad += 1
     current_smiley_kind = kind
-    smiley_override_time = ts
+    smiley_override_time = time.monotonic()
     # update EMA
     val = 1.0 if kind == "good" else (0.0 if kind == "meh" else -1.0)
     smiley_ema = (SMILEY_EMA_ALPHA * val) + ((1 - SMILEY_EMA_ALPHA) * smiley_ema)
@@ -260,9 +262,11 @@ def _start_and_run_ui():
     USE_SCD = args.use_scd
     USE_BME = args.use_bme
     USE_MIC = args.use_mic
+    INT_GPIO = args.int_gpio
 
     # Start sensor thread (simulator on desktop if no hardware)
-    sensor.start(poll_interval=POLL_INTERVAL, use_scd=USE_SCD, use_bme=USE_BME, use_mic=USE_MIC)
+    sensor.start(poll_interval=POLL_INTERVAL, use_scd=USE_SCD, use_bme=USE_BME, use_mic=USE_MIC,
+                 int_gpio=INT_GPIO)
     _LOG.info("Started sensors (simulator/hardware depending on environment)")
 
     # Import UI here to avoid circular imports at module import time
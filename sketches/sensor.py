@@ -22,7 +22,11 @@ Behavior:
 from dataclasses import dataclass
 import time
 import threading
+import queue
 import os
+import sys
+import errno
+import struct
 import math
 import random
 import logging
@@ -49,6 +53,14 @@ try:
 except Exception:
     SMBUS_AVAILABLE = False
 
+# optional: CCS811 nINT wired to a GPIO lets the runner wake on data-ready
+try:
+    import RPi.GPIO as GPIO
+except Exception:
+    GPIO = None
+# upper bound for one nINT wait; in 1 s drive mode a result is due well before this
+_INT_WAIT_TIMEOUT_MS = 2000
+
 # CCS811 registers / commands / masks
 _CCS_ADDR_DEFAULT = 0x5A
 _CCS_REG_STATUS = 0x00
@@ -61,9 +73,14 @@ _CCS_CMD_APP_START = 0xF4
 _CCS_STATUS_DATA_READY = 0x08
 _CCS_STATUS_ERROR = 0x01
 _CCS_STATUS_APP_VALID = 0x10
+_CCS_STATUS_FW_MODE = 0x80
 
-# drive mode values
-_DRIVE_MODE_VALUES = {0:0x00, 1:0x10, 2:0x20, 3:0x30, 4:0x40}
+# drive mode values (MEAS_MODE bits 6:4), indexed by drive mode 0..4
+_DRIVE_MODE_VALUES = (0x00, 0x10, 0x20, 0x30, 0x40)
+
+# ALG_RESULT_DATA layout: eCO2 (u16), TVOC (u16), STATUS (u8), ERROR_ID (u8); BASELINE: u16
+_ALG = struct.Struct(">HHBB")
+_BASELINE = struct.Struct(">H")
 
 # default baseline file (relative to module directory)
 _BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
@@ -73,6 +90,56 @@ _DEFAULT_BASELINE_FILE = os.path.join(_BASE_DIR, "ccs811_baseline.bin")
 # max buffer size
 _MAX_BUFFER = 600  # keep recent samples (e.g. 2*polls per sec * minutes)
 
+def _fsync_dir(d):
+    """fsync a directory so a preceding rename in it survives a power cut (no-op on Windows)."""
+    if sys.platform == "win32":
+        return
+    dfd = os.open(d or ".", os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+def _write_atomic(path, data):
+    """
+    Durably replace path with data (write, fsync, rename, fsync dir).
+    On Linux the data goes into an unnamed O_TMPFILE inode that is only linked
+    into the directory once complete, so a kill mid-save leaves no partial temp
+    file behind. Falls back to a named temp file where that is unsupported.
+    """
+    d = os.path.dirname(path)
+    tmp = path + ".tmp"
+    fd = None
+    linked = False
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(d or ".", os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL):
+                raise
+    if fd is not None:
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+            try:
+                os.unlink(tmp)  # stale leftover from an older, interrupted save
+            except FileNotFoundError:
+                pass
+            try:
+                os.link(f"/proc/self/fd/{fd}", tmp)
+                linked = True
+            except OSError:
+                pass  # no /proc or linkat refused (some containers): use the named temp file
+        finally:
+            os.close(fd)
+    if not linked:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(d)
+
 # --- CCS811 wrapper ---
 class CCS811:
     def __init__(self, busnum=1, address=_CCS_ADDR_DEFAULT, baseline_file=_DEFAULT_BASELINE_FILE, logger=_LOG):
@@ -82,6 +149,10 @@ class CCS811:
         self.logger = logger
         self.bus = None
         self.inited = False
+        # HW_ID is fixed in ROM: verify it on the first init() only, not on every re-init
+        self._hw_verified = False
+        # last baseline known to be on disk (loaded or saved); lets periodic saves skip rewrites
+        self._saved_baseline = None
 
         if not SMBUS_AVAILABLE:
             raise RuntimeError("smbus not available on this platform")
@@ -92,48 +163,62 @@ class CCS811:
             raise RuntimeError(f"Failed to open I2C bus {self.busnum}: {e}")
 
     # low-level safe wrappers
-    def _read_byte(self, reg, retries=3, delay=0.05):
+    @staticmethod
+    def _retry_i2c(fn, *args, retries=3, base=0.001, cap=0.02):
+        """
+        Call fn(*args), retrying on OSError. The CCS811 answers within ~1 ms, so
+        back off exponentially from base (1 ms) up to cap (20 ms) instead of a fixed 50 ms.
+        """
+        delay = base
         for i in range(retries):
             try:
-                return self.bus.read_byte_data(self.address, reg)
+                return fn(*args)
             except OSError:
-                if i < retries - 1:
-                    time.sleep(delay)
-                    continue
-                raise
+                if i == retries - 1:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, cap)
 
-    def _read_block(self, reg, length, retries=3, delay=0.05):
-        for i in range(retries):
-            try:
-                return self.bus.read_i2c_block_data(self.address, reg, length)
-            except OSError:
-                if i < retries - 1:
-                    time.sleep(delay)
-                    continue
-                raise
+    def _read_byte(self, reg, retries=3):
+        return self._retry_i2c(self.bus.read_byte_data, self.address, reg, retries=retries)
 
-    def _write_block(self, reg, data, retries=3, delay=0.05):
-        for i in range(retries):
+    def _read_block(self, reg, length, retries=3):
+        return self._retry_i2c(self.bus.read_i2c_block_data, self.address, reg, length, retries=retries)
+
+    def _write_block(self, reg, data, retries=3):
+        return self._retry_i2c(self.bus.write_i2c_block_data, self.address, reg, data, retries=retries)
+
+    def _wait_fw_mode(self, timeout=0.12, interval=0.002):
+        """
+        Poll STATUS until FW_MODE (application mode) is set after APP_START.
+        A healthy sensor switches within ~1 ms, so this usually returns on the
+        first or second read instead of sleeping a fixed 100 ms.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
             try:
-                return self.bus.write_i2c_block_data(self.address, reg, data)
+                if self.bus.read_byte_data(self.address, _CCS_REG_STATUS) & _CCS_STATUS_FW_MODE:
+                    return True
             except OSError:
-                if i < retries - 1:
-                    time.sleep(delay)
-                    continue
-                raise
+                pass  # may NACK while switching to application mode
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
 
     def init(self, restore_baseline=True, drive_mode=1, interrupt=False):
         """
         Initialize CCS811:
-        - check HW_ID
+        - check HW_ID (first call only)
         - check APP_VALID in STATUS
         - send APP_START
         - optionally restore baseline
         - set MEAS_MODE
         """
-        hw = self._read_byte(_CCS_REG_HW_ID)
-        if hw != 0x81:
-            raise RuntimeError(f"Unexpected HW_ID 0x{hw:02X} (expected 0x81)")
+        if not self._hw_verified:
+            hw = self._read_byte(_CCS_REG_HW_ID)
+            if hw != 0x81:
+                raise RuntimeError(f"Unexpected HW_ID 0x{hw:02X} (expected 0x81)")
+            self._hw_verified = True
 
         status = self._read_byte(_CCS_REG_STATUS)
         if not (status & _CCS_STATUS_APP_VALID):
@@ -143,12 +228,13 @@ class CCS811:
         # but smbus write_byte takes address and value; use bus methods:
         try:
             self.bus.write_byte(self.address, _CCS_CMD_APP_START)
-            time.sleep(0.1)
         except Exception as e:
             raise RuntimeError(f"Failed to send APP_START: {e}")
+        if not self._wait_fw_mode():
+            self.logger.warning("CCS811 did not report FW_MODE after APP_START")
 
         # optional baseline restore
-        if restore_baseline and os.path.exists(self.baseline_file):
+        if restore_baseline:
             try:
                 b = self._load_baseline_file(self.baseline_file)
                 if b is not None:
@@ -157,17 +243,18 @@ class CCS811:
                     lsb = b & 0xFF
                     self._write_block(_CCS_REG_BASELINE, [msb, lsb])
                     time.sleep(0.05)
+                    self._saved_baseline = b
                     self.logger.info("Restored baseline 0x%04X from %s", b, self.baseline_file)
             except Exception as e:
                 self.logger.warning("Failed to restore baseline: %s", e)
 
         # set MEAS_MODE
-        val = _DRIVE_MODE_VALUES.get(drive_mode, 0x10)
+        val = _DRIVE_MODE_VALUES[drive_mode] if 0 <= drive_mode < len(_DRIVE_MODE_VALUES) else 0x10
         if interrupt:
             val |= 0x08
         try:
+            # takes effect immediately in application mode; no settle delay needed
             self.bus.write_byte_data(self.address, _CCS_REG_MEAS_MODE, val)
-            time.sleep(0.05)
         except Exception as e:
             raise RuntimeError(f"Failed to set MEAS_MODE: {e}")
 
@@ -179,30 +266,34 @@ class CCS811:
         Read ALG_RESULT_DATA (8 bytes) and return (eco2, tvoc, status, error_id, raw)
         """
         raw = self._read_block(_CCS_REG_ALG_RESULT_DATA, 8)
-        eco2 = (raw[0] << 8) | raw[1]
-        tvoc = (raw[2] << 8) | raw[3]
-        status = raw[4]
-        error_id = raw[5]
+        eco2, tvoc, status, error_id = _ALG.unpack_from(bytes(raw))
         return eco2, tvoc, status, error_id, raw
 
     def read_baseline(self):
         b = self._read_block(_CCS_REG_BASELINE, 2)
-        return (b[0] << 8) | b[1]
+        return _BASELINE.unpack_from(bytes(b))[0]
 
     def save_baseline_file(self, path=None):
+        return self.write_baseline_file(self.read_baseline(), path)
+
+    def write_baseline_file(self, b, path=None):
+        """
+        Persist an already read baseline value (file I/O only, no I2C), so it can
+        run off the sensor thread.
+        """
         path = path or self.baseline_file
         try:
-            b = self.read_baseline()
+            if b == self._saved_baseline and path == self.baseline_file:
+                # unchanged since the last save/restore: skip the temp file + fsync + rename
+                self.logger.debug("Baseline 0x%04X unchanged, not rewriting %s", b, path)
+                return b
             # atomic write
             d = os.path.dirname(path)
-            if d and not os.path.exists(d):
+            if d:
                 os.makedirs(d, exist_ok=True)
-            tmp = path + ".tmp"
-            with open(tmp, "wb") as f:
-                f.write(bytes([(b >> 8) & 0xFF, b & 0xFF]))
-                f.flush()
-                os.fsync(f.fileno())
-            os.replace(tmp, path)
+            _write_atomic(path, _BASELINE.pack(b))
+            if path == self.baseline_file:
+                self._saved_baseline = b
             self.logger.info("Saved baseline 0x%04X to %s", b, path)
             return b
         except Exception as e:
@@ -211,14 +302,20 @@ class CCS811:
 
     @staticmethod
     def _load_baseline_file(path):
+        """Return the 2-byte baseline stored in path, or None if missing/invalid."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
         try:
-            with open(path, "rb") as f:
-                data = f.read()
-            if len(data) != 2:
-                return None
-            return (data[0] << 8) | data[1]
-        except Exception:
+            data = os.read(fd, 3)  # 3, not 2: an overlong file shows up without a stat()
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+        if len(data) != 2:
             return None
+        return _BASELINE.unpack_from(data)[0]
 
 # --- Simulator (used when no smbus / no hardware) ---
 class Simulator:
@@ -256,7 +353,7 @@ class Simulator:
 class SensorRunner:
     def __init__(self, poll_interval=2.0, use_scd=False, use_bme=False, use_mic=False,
                  ccs_bus=1, ccs_addr=_CCS_ADDR_DEFAULT, baseline_file=_DEFAULT_BASELINE_FILE,
-                 baseline_save_interval=3600):
+                 baseline_save_interval=3600, int_gpio=None):
         self.poll_interval = max(0.1, float(poll_interval))
         self.use_scd = use_scd
         self.use_bme = use_bme
@@ -269,10 +366,17 @@ class SensorRunner:
         # baseline config
         self.baseline_file = baseline_file
         self.baseline_save_interval = baseline_save_interval
+        # baseline file writes (fsync can take 10-100 ms on SD cards) run on a
+        # separate thread; the sensor loop only reads the register and enqueues
+        self._save_q = queue.Queue(maxsize=2)
+        self._save_thread = None
 
         # hardware config
         self.ccs_bus = ccs_bus
         self.ccs_addr = ccs_addr
+        # BCM pin wired to CCS811 nINT (None = plain timed polling)
+        self.int_gpio = int_gpio
+        self._int_pin = None
 
         # simulation fallback
         self.simulator = None
@@ -284,10 +388,24 @@ class SensorRunner:
             self.ccs = self.simulator
             return
 
+        # nINT pin first and on its own: a missing RPi.GPIO or a busy/forbidden pin only
+        # costs interrupt mode, not a working CCS811
+        if self.int_gpio is not None:
+            try:
+                if GPIO is None:
+                    raise RuntimeError("RPi.GPIO not available")
+                GPIO.setmode(GPIO.BCM)
+                GPIO.setup(self.int_gpio, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+                self._int_pin = self.int_gpio
+            except Exception as e:
+                _LOG.warning("nINT GPIO %s setup failed (%s); using timed polling", self.int_gpio, e)
+                self.int_gpio = None
+                self._int_pin = None
+
         try:
             self.ccs = CCS811(busnum=self.ccs_bus, address=self.ccs_addr, baseline_file=self.baseline_file)
             # restore baseline (if present) and start in 1s mode
-            self.ccs.init(restore_baseline=True, drive_mode=1, interrupt=False)
+            self.ccs.init(restore_baseline=True, drive_mode=1, interrupt=self._int_pin is not None)
         except Exception as e:
             _LOG.warning("CCS811 init failed: %s — falling back to simulator", e)
             self.simulator = Simulator()
@@ -299,6 +417,8 @@ class SensorRunner:
             return
         self.running = True
         self._init_ccs()
+        self._save_thread = threading.Thread(target=self._save_worker, name="baseline-save", daemon=True)
+        self._save_thread.start()
         self.thread = threading.Thread(target=self._loop, daemon=True)
         self.thread.start()
         _LOG.info("SensorRunner started (poll_interval=%.2f)", self.poll_interval)
@@ -308,9 +428,38 @@ class SensorRunner:
             return
         self.running = False
         if self.thread:
-            self.thread.join(timeout=2.0)
+            # the loop may be blocked in wait_for_edge (up to _INT_WAIT_TIMEOUT_MS) or in the
+            # deadline sleep (up to poll_interval): give it longer than either to notice
+            self.thread.join(timeout=_INT_WAIT_TIMEOUT_MS / 1000.0 + self.poll_interval + 1.0)
+        if self._save_thread:
+            # drain pending saves, then let the worker exit
+            self._save_q.put(None)
+            self._save_thread.join(timeout=5.0)
+            self._save_thread = None
+        if self._int_pin is not None:
+            if self.thread is not None and self.thread.is_alive():
+                # never pull the pin out from under a loop that may still be waiting on it
+                _LOG.warning("Sensor thread still running; leaving nINT GPIO %s set up", self._int_pin)
+            else:
+                try:
+                    GPIO.cleanup(self._int_pin)
+                except Exception:
+                    pass
+                self._int_pin = None
         _LOG.info("SensorRunner stopped")
 
+    def _save_worker(self):
+        while True:
+            item = self._save_q.get()
+            if item is None:
+                break
+            ccs, b = item
+            try:
+                ccs.write_baseline_file(b, self.baseline_file)
+                _LOG.debug("Periodic baseline saved: 0x%04X", b)
+            except Exception as e:
+                _LOG.warning("Failed to periodic-save baseline: %s", e)
+
     def _append_sample(self, temp, db, co2, voc):
         s = SensorSample(temp=float(temp), db=float(db), co2=int(co2), voc=int(voc), ts=time.time())
         with self.lock:
@@ -329,15 +478,18 @@ class SensorRunner:
         return msgs or [f"UNKNOWN(0x{err:02X})"]
 
     def _loop(self):
-        last_baseline_save = time.time()
+        last_baseline_save = time.monotonic()
         # starting temp/db placeholders (could hook BME or mic here)
         temp = 22.0
         db = 0.0
 
         # small warmup delay so device is ready
         time.sleep(0.2)
+        next_t = time.monotonic()
 
         while self.running:
+            # one clock read per tick; monotonic so wall-clock jumps (NTP) don't trigger/skip saves
+            now = time.monotonic()
             try:
                 co2 = 0
                 tvoc = 0
@@ -349,7 +501,7 @@ class SensorRunner:
                     # attempt re-init for hardware backend
                     if isinstance(self.ccs, CCS811):
                         try:
-                            self.ccs.init(restore_baseline=True, drive_mode=1)
+                            self.ccs.init(restore_baseline=True, drive_mode=1, interrupt=self._int_pin is not None)
                             eco2, tvoc, status, errid, raw = self.ccs.read()
                         except Exception as e2:
                             _LOG.error("Re-init/read failed: %s", e2)
@@ -371,7 +523,7 @@ class SensorRunner:
                     if errid & 0x02 and isinstance(self.ccs, CCS811):
                         _LOG.info("APP_INVALID detected, attempting re-init")
                         try:
-                            self.ccs.init(restore_baseline=True, drive_mode=1)
+                            self.ccs.init(restore_baseline=True, drive_mode=1, interrupt=self._int_pin is not None)
                         except Exception as e:
                             _LOG.error("Re-init after APP_INVALID failed: %s", e)
 
@@ -386,36 +538,60 @@ class SensorRunner:
                 self._append_sample(temp, db, co2, voc)
 
                 # periodic baseline save
-                if self.baseline_file and (time.time() - last_baseline_save) >= self.baseline_save_interval:
+                if self.baseline_file and (now - last_baseline_save) >= self.baseline_save_interval:
                     try:
                         if isinstance(self.ccs, CCS811):
-                            b = self.ccs.save_baseline_file(self.baseline_file)
-                            _LOG.debug("Periodic baseline saved: 0x%04X", b if b is not None else 0)
+                            # I2C read stays on this thread; the file write goes to _save_worker
+                            self._save_q.put_nowait((self.ccs, self.ccs.read_baseline()))
                         else:
                             # simulator - noop
                             pass
+                    except queue.Full:
+                        _LOG.debug("Baseline save still in flight; skipping this one")
                     except Exception as e:
                         _LOG.warning("Failed to periodic-save baseline: %s", e)
-                    last_baseline_save = time.time()
+                    last_baseline_save = now
 
             except Exception as e:
                 _LOG.exception("Unhandled exception in sensor loop: %s", e)
 
-            # sleep respecting poll_interval
-            time.sleep(self.poll_interval)
+            if self._int_pin is not None and isinstance(self.ccs, CCS811):
+                # interrupt mode: the sensor's data-ready paces the loop (1 s drive mode)
+                # instead of the sleep. nINT is held low while a result is pending;
+                # otherwise block in the kernel until the next falling edge.
+                try:
+                    if GPIO.input(self._int_pin) == GPIO.HIGH:
+                        GPIO.wait_for_edge(self._int_pin, GPIO.FALLING, timeout=_INT_WAIT_TIMEOUT_MS)
+                    next_t = time.monotonic()
+                    continue
+                except Exception as e:
+                    _LOG.warning("nINT wait failed (%s); falling back to timed polling", e)
+                    self._int_pin = None
+
+            # deadline scheduling: the read/re-init time must not add up as drift
+            next_t += self.poll_interval
+            delay = next_t - time.monotonic()
+            if delay <= 0:
+                # fell behind (slow re-init etc.): resync instead of bursting to catch up
+                next_t = time.monotonic()
+                delay = 0
+            time.sleep(delay)
 
 # Module-level runner that device.py will use
 _RUNNER = None
 
-def start(poll_interval=2.0, use_scd=False, use_bme=False, use_mic=False):
+def start(poll_interval=2.0, use_scd=False, use_bme=False, use_mic=False, int_gpio=None):
     """
     Start sensor sampling in background. device.py calls this.
+    int_gpio: optional BCM pin wired to the CCS811 nINT line (enables interrupt mode;
+    samples then follow the sensor's 1 s data-ready instead of poll_interval).
     """
     global _RUNNER
     if _RUNNER and _RUNNER.running:
         _LOG.info("Sensor already running")
         return
-    _RUNNER = SensorRunner(poll_interval=poll_interval, use_scd=use_scd, use_bme=use_bme, use_mic=use_mic)
+    _RUNNER = SensorRunner(poll_interval=poll_interval, use_scd=use_scd, use_bme=use_bme, use_mic=use_mic,
+                           int_gpio=int_gpio)
     _RUNNER.start()
 
 def stop():
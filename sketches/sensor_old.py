@@ -10,7 +10,8 @@ Provides:
 - start(poll_interval, use_scd, use_bme): starts a daemon thread that periodically reads sensors
   and appends tuples (temp, db, co2, voc, timestamp) to sensor_buffer.
 - stop(): stops the thread and cleans up sensors.
-- sensor_buffer: a list shared with callers (max length capped).
+- sensor_buffer: a deque shared with callers (max length capped).
+- latest(): most recent sample tuple, or None.
 
 Behavior:
 - Requires Adafruit/CircuitPython libs and I2C to be available. Simulator fallback has been
@@ -25,14 +26,54 @@ if TYPE_CHECKING:
 
 import importlib
 import time
+from collections import deque
 import threading
 import logging
+import logging.handlers
+import queue
 
 _LOG = logging.getLogger("sensor")
 logging.basicConfig(level=logging.INFO)
 
-sensor_buffer = []   # list of tuples (temp, db, co2, voc, timestamp)
+# While the sensor thread runs it only enqueues log records; a QueueListener thread does
+# the (possibly blocking) handler IO so I2C error storms cannot stall the poll loop.
+# Set up in start() / torn down in stop(), nothing happens at import time.
+_log_queue = queue.SimpleQueue()
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_listener = None
+
+def _start_log_listener():
+    """Route the "sensor" logger through the queue to the root logger's handlers."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    # the app's configured handlers (and formats); basicConfig's format if there are none
+    handlers = logging.getLogger().handlers
+    if not handlers:
+        fallback = logging.StreamHandler()
+        fallback.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        handlers = [fallback]
+    _log_listener = logging.handlers.QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    _LOG.addHandler(_log_queue_handler)
+    _LOG.propagate = False   # records reach the root handlers via the listener instead
+    _log_listener.start()
+
+def _stop_log_listener():
+    """Flush queued records and restore normal propagation."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    _LOG.removeHandler(_log_queue_handler)
+    _LOG.propagate = True
+    _log_listener.stop()
+    _log_listener = None
+
+# Single writer (the sensor thread), many readers. deque.append() and buf[-1] are atomic
+# under the GIL and maxlen trims for us, so no lock is needed; last-value reads are
+# stale-tolerant.
 _MAX_BUFFER = 500
+sensor_buffer = deque(maxlen=_MAX_BUFFER)   # raw tuples (temp, db, co2, voc, timestamp)
+_latest = None   # most recent tuple, republished by plain assignment (atomic)
 
 def _try_import(module_name: str, attr: str = None):
     try:
@@ -51,7 +92,24 @@ _sensor_hub = None
 _sensor_thread = None
 _stop_event = threading.Event()
 _hub_available = False
-_lock = threading.Lock()
+
+def _wait_for(cond, timeout, initial=0.01, max_wait=0.2):
+    """
+    Wait until cond() is true, timeout expires or stop() is requested.
+    Sleeps via _stop_event.wait() with exponential backoff (initial .. max_wait).
+    Returns the last value of cond().
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    ok = cond()
+    while not ok and not _stop_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        _stop_event.wait(min(delay, remaining))
+        delay = min(delay * 2, max_wait)
+        ok = cond()
+    return ok
 
 class SensorHub:
     def __init__(self, use_scd=False, use_bme=False):
@@ -75,9 +133,7 @@ class SensorHub:
             raise RuntimeError("adafruit-circuitpython-ccs811 not installed")
         try:
             self.ccs = adafruit_ccs811.CCS811(self.i2c)
-            start = time.time()
-            while not getattr(self.ccs, "data_ready", True) and time.time() - start < 5.0:
-                time.sleep(0.05)
+            _wait_for(lambda: getattr(self.ccs, "data_ready", True), 5.0)
         except Exception as e:
             _LOG.exception("CCS811 init failed: %s", e)
             raise
@@ -97,15 +153,17 @@ class SensorHub:
                     self.scd.start_periodic_measurement()
                 except Exception:
                     pass
-                start = time.time()
-                while getattr(self.scd, "data_ready", True) is False and time.time() - start < 5.0:
-                    time.sleep(0.05)
+                _wait_for(lambda: getattr(self.scd, "data_ready", True) is not False, 5.0)
             except Exception:
                 _LOG.exception("SCD4x init failed; continuing without SCD")
                 self.scd = None
                 self.use_scd = False
 
     def read_once(self):
+        """
+        Read all sensors once. Returns None if stop() was requested between the
+        SCD/BME and the CCS read so shutdown does not wait for the second bus round.
+        """
         result = {
             "ccs_eco2": None,
             "ccs_tvoc": None,
@@ -115,15 +173,24 @@ class SensorHub:
             "temp_source": None,
         }
 
-        try:
-            if self.scd is not None:
-                result["scd_co2"] = getattr(self.scd, "co2", None)
-                result["scd_temp_c"] = getattr(self.scd, "temperature", None)
-                result["scd_rh_pct"] = getattr(self.scd, "relative_humidity", None)
-                if result["scd_temp_c"] is not None:
+        self._read_scd(result)
+        if _stop_event.is_set():
+            return None
+        self._read_ccs(result)
+        return result
+
+    def _read_scd(self, result):
+        scd = self.scd
+        if scd is not None:
+            try:
+                co2, temp_c, rh = scd.co2, scd.temperature, scd.relative_humidity
+                result["scd_co2"] = co2
+                result["scd_temp_c"] = temp_c
+                result["scd_rh_pct"] = rh
+                if temp_c is not None:
                     result["temp_source"] = "scd"
-        except Exception:
-            _LOG.exception("SCD read failed")
+            except Exception:
+                _LOG.warning("SCD read failed", exc_info=_LOG.isEnabledFor(logging.DEBUG))
 
         if result["temp_source"] is None and self.bme is not None:
             try:
@@ -131,8 +198,9 @@ class SensorHub:
                 result["scd_temp_c"] = t
                 result["temp_source"] = "bme"
             except Exception:
-                _LOG.exception("BME read failed")
+                _LOG.warning("BME read failed", exc_info=_LOG.isEnabledFor(logging.DEBUG))
 
+    def _read_ccs(self, result):
         try:
             if result["scd_temp_c"] is not None:
                 try:
@@ -147,9 +215,7 @@ class SensorHub:
                 result["ccs_eco2"] = getattr(self.ccs, "eco2", None)
                 result["ccs_tvoc"] = getattr(self.ccs, "tvoc", None)
         except Exception:
-            _LOG.exception("CCS read failed")
-
-        return result
+            _LOG.warning("CCS read failed", exc_info=_LOG.isEnabledFor(logging.DEBUG))
 
     def close(self):
         try:
@@ -161,8 +227,19 @@ class SensorHub:
         except Exception:
             _LOG.exception("Error during SCD shutdown")
 
+def latest():
+    """
+    Return the most recent sample as (temp, db, co2, voc, timestamp) rounded to the
+    usual display format, or None if nothing was measured yet.
+    """
+    s = _latest
+    if s is None:
+        return None
+    temp, db, co2, voc, ts = s
+    return round(float(temp), 2), round(float(db), 1), int(co2), int(voc), ts
+
 def _sensor_loop(poll_interval, use_scd, use_bme):
-    global _sensor_hub, _hub_available
+    global _sensor_hub, _hub_available, _latest
 
     # Simulator fallback intentionally disabled: require real hardware/libs.
     if board is None or adafruit_ccs811 is None:
@@ -177,10 +254,25 @@ def _sensor_loop(poll_interval, use_scd, use_bme):
         _LOG.exception("SensorHub initialization failed and simulator is disabled: %s", e)
         return
 
-    while not _stop_event.is_set():
+    # hot loop: bind frequently used callables once
+    _read_once = _sensor_hub.read_once
+    _append = sensor_buffer.append
+    _wait = _stop_event.wait
+    _is_set = _stop_event.is_set
+    _monotonic = time.monotonic
+
+    # Schedule reads on a fixed grid (next_t += poll_interval) so the read duration
+    # does not add up as drift. Clamp silly intervals to something the bus can do.
+    poll_interval = max(0.1, float(poll_interval))
+    next_t = _monotonic()
+    behind_logged = False
+
+    while not _is_set():
         ts = time.time()
         try:
-            s = _sensor_hub.read_once()
+            s = _read_once()
+            if s is None:
+                break
 
             # Require actual sensor values. If critical values are missing, stop.
             temp = s.get("scd_temp_c")
@@ -201,19 +293,25 @@ def _sensor_loop(poll_interval, use_scd, use_bme):
 
             # db (decibel) measurement is not provided by these sensors. Set to 0.0 to keep tuple shape.
             db = 0.0
-            voc = int(tvoc)
 
-            # Append the measured values (rounded to existing format)
-            with _lock:
-                sensor_buffer.append((round(float(temp), 2), round(float(db), 1), int(co2_val), int(voc), ts))
-                if len(sensor_buffer) > _MAX_BUFFER:
-                    sensor_buffer.pop(0)
+            # Append the raw driver values; rounding/coercion is done on the read side (latest()).
+            sample = (temp, db, co2_val, tvoc, ts)
+            _append(sample)
+            _latest = sample
 
         except Exception:
             _LOG.exception("Error reading SensorHub; stopping sensor loop (simulator disabled).")
             break
 
-        _stop_event.wait(poll_interval)
+        next_t += poll_interval
+        delay = next_t - _monotonic()
+        if delay <= 0:
+            if not behind_logged:
+                _LOG.warning("Sensor loop is falling behind (poll_interval=%.2fs); resyncing.", poll_interval)
+                behind_logged = True
+            next_t = _monotonic()
+            delay = 0
+        _wait(delay)
 
     try:
         if _sensor_hub is not None:
@@ -228,7 +326,9 @@ def start(poll_interval=2.0, use_scd=False, use_bme=False):
         _LOG.debug("Sensor thread already running.")
         return
     _stop_event.clear()
-    _sensor_thread = threading.Thread(target=_sensor_loop, args=(poll_interval, use_scd, use_bme), daemon=True)
+    _start_log_listener()
+    _sensor_thread = threading.Thread(target=_sensor_loop, args=(poll_interval, use_scd, use_bme),
+                                      name="sensor", daemon=True)
     _sensor_thread.start()
     _LOG.info("Sensor thread started (interval=%s, use_scd=%s, use_bme=%s)", poll_interval, use_scd, use_bme)
 
@@ -238,4 +338,5 @@ def stop():
     if _sensor_thread is not None:
         _sensor_thread.join(timeout=3.0)
     _sensor_thread = None
-    _LOG.info("Sensor module stopped.")
\ No newline at end of file
+    _LOG.info("Sensor module stopped.")
+    _stop_log_listener()
\ No newline at end of file
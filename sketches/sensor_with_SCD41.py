@@ -17,6 +17,8 @@ from dataclasses import dataclass
 import time
 import threading
 import os
+import sys
+import errno
 import struct
 import math
 import random
@@ -36,6 +38,63 @@ class SensorSample:
     voc: int
     ts: float
 
+# drive mode values (MEAS_MODE bits 6:4), indexed by drive mode 0..4
+_DRIVE_MODE_VALUES = (0x00, 0x10, 0x20, 0x30, 0x40)
+
+# ALG_RESULT_DATA layout: eCO2 (u16), TVOC (u16), STATUS (u8), ERROR_ID (u8)
+_ALG = struct.Struct(">HHBB")
+_BASELINE = struct.Struct(">H")
+
+def _fsync_dir(d):
+    """fsync a directory so a preceding rename in it survives a power cut (no-op on Windows)."""
+    if sys.platform == "win32":
+        return
+    dfd = os.open(d or ".", os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+def _write_atomic(path, data):
+    """
+    Durably replace path with data (write, fsync, rename, fsync dir).
+    On Linux the data goes into an unnamed O_TMPFILE inode that is only linked
+    into the directory once complete, so a kill mid-save leaves no partial temp
+    file behind. Falls back to a named temp file where that is unsupported.
+    """
+    d = os.path.dirname(path)
+    tmp = path + ".tmp"
+    fd = None
+    linked = False
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(d or ".", os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL):
+                raise
+    if fd is not None:
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+            try:
+                os.unlink(tmp)  # stale leftover from an older, interrupted save
+            except FileNotFoundError:
+                pass
+            try:
+                os.link(f"/proc/self/fd/{fd}", tmp)
+                linked = True
+            except OSError:
+                pass  # no /proc or linkat refused (some containers): use the named temp file
+        finally:
+            os.close(fd)
+    if not linked:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(d)
+
 # Try to import smbus2 first (better I2C support), fall back to smbus
 SMBUS2 = False
 try:
@@ -176,87 +235,143 @@ class CCS811:
     STATUS_DATA_READY = 0x08
     STATUS_ERROR = 0x01
     STATUS_APP_VALID = 0x10
+    STATUS_FW_MODE = 0x80
 
     def __init__(self, busnum=1, address=None, baseline_file=None, logger=_LOG):
         self.address = address or self.ADDR
         self.busnum = busnum
         self.baseline_file = baseline_file
         self.logger = logger
+        # last baseline known to be on disk (restored or saved); lets periodic saves skip rewrites
+        self._saved_baseline = None
+        # HW_ID is fixed in ROM: verify it on the first init() only, not on every re-init
+        self._hw_verified = False
         if SMBus is None:
             raise RuntimeError("I2C bus not available")
         try:
             self.bus = SMBus(busnum)
         except Exception as e:
             raise RuntimeError(f"Failed to open I2C bus {busnum}: {e}")
+        # ALG_RESULT_DATA is read every tick: build the smbus2 messages once and let
+        # i2c_rdwr refill the same 8-byte buffer instead of allocating a new list per read
+        if SMBUS2:
+            self._alg_reg_msg = i2c_msg.write(self.address, [self.REG_ALG])
+            self._alg_rd_msg = i2c_msg.read(self.address, 8)
 
-    def _read_byte(self, reg, retries=3):
+    @staticmethod
+    def _retry_i2c(fn, *args, retries=3, base=0.001, cap=0.02):
+        """Call fn(*args), retrying on OSError with exponential backoff (1 ms doubling, capped at 20 ms)."""
+        delay = base
         for i in range(retries):
             try:
-                return self.bus.read_byte_data(self.address, reg)
-            except Exception:
-                time.sleep(0.02)
-        raise
+                return fn(*args)
+            except OSError:
+                if i == retries - 1:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, cap)
+
+    def _read_byte(self, reg, retries=3):
+        return self._retry_i2c(self.bus.read_byte_data, self.address, reg, retries=retries)
 
     def _read_block(self, reg, length, retries=3):
-        for i in range(retries):
-            try:
-                return self.bus.read_i2c_block_data(self.address, reg, length)
-            except Exception:
-                time.sleep(0.02)
-        raise
+        return self._retry_i2c(self.bus.read_i2c_block_data, self.address, reg, length, retries=retries)
 
     def _write_block(self, reg, data, retries=3):
-        for i in range(retries):
+        return self._retry_i2c(self.bus.write_i2c_block_data, self.address, reg, data, retries=retries)
+
+    def _read_hw_id_and_status(self):
+        """
+        Read HW_ID and STATUS. With smbus2 both register reads go out as one
+        i2c_rdwr transfer (repeated starts) instead of two separate transactions.
+        """
+        if not SMBUS2:
+            return self._read_byte(self.REG_HW_ID), self._read_byte(self.REG_STATUS)
+        hw_rd = i2c_msg.read(self.address, 1)
+        st_rd = i2c_msg.read(self.address, 1)
+        self._retry_i2c(self.bus.i2c_rdwr,
+                        i2c_msg.write(self.address, [self.REG_HW_ID]), hw_rd,
+                        i2c_msg.write(self.address, [self.REG_STATUS]), st_rd)
+        return list(hw_rd)[0], list(st_rd)[0]
+
+    def _wait_fw_mode(self, timeout=0.12, interval=0.002):
+        """Poll STATUS until FW_MODE is set after APP_START (usually ~1 ms) instead of a fixed sleep."""
+        deadline = time.monotonic() + timeout
+        while True:
             try:
-                return self.bus.write_i2c_block_data(self.address, reg, data)
-            except Exception:
-                time.sleep(0.02)
-        raise
+                if self.bus.read_byte_data(self.address, self.REG_STATUS) & self.STATUS_FW_MODE:
+                    return True
+            except OSError:
+                pass  # may NACK while switching to application mode
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
 
     def init(self, restore_baseline=True, drive_mode=1, interrupt=False):
-        hw = self._read_byte(self.REG_HW_ID)
-        if hw != 0x81:
-            raise RuntimeError(f"Unexpected CCS811 HW_ID 0x{hw:02X}")
-        status = self._read_byte(self.REG_STATUS)
+        if self._hw_verified:
+            status = self._read_byte(self.REG_STATUS)
+        else:
+            hw, status = self._read_hw_id_and_status()
+            if hw != 0x81:
+                raise RuntimeError(f"Unexpected CCS811 HW_ID 0x{hw:02X}")
+            self._hw_verified = True
         if not (status & self.STATUS_APP_VALID):
             raise RuntimeError(f"CCS811 APP_VALID not set (STATUS=0x{status:02X})")
         # APP_START command (write_byte)
         try:
             # smbus write_byte(address, value) writes a single byte to device; that's fine for command-only
             self.bus.write_byte(self.address, self.CMD_APP_START)
-            time.sleep(0.05)
         except Exception as e:
             raise RuntimeError(f"Failed to send APP_START to CCS811: {e}")
+        if not self._wait_fw_mode():
+            self.logger.warning("CCS811: FW_MODE not set after APP_START")
 
         # restore baseline if requested
-        if restore_baseline and self.baseline_file and os.path.exists(self.baseline_file):
+        if restore_baseline and self.baseline_file:
             try:
-                with open(self.baseline_file, "rb") as f:
-                    bdata = f.read()
-                if len(bdata) == 2:
-                    msb, lsb = bdata[0], bdata[1]
-                    self._write_block(self.REG_BASELINE, [msb, lsb])
+                b = self._load_baseline_file(self.baseline_file)
+                if b is not None:
+                    self._write_block(self.REG_BASELINE, [(b >> 8) & 0xFF, b & 0xFF])
                     time.sleep(0.02)
-                    self.logger.info("CCS811: restored baseline 0x%02X%02X", msb, lsb)
+                    self._saved_baseline = b
+                    self.logger.info("CCS811: restored baseline 0x%04X", b)
             except Exception as e:
                 self.logger.warning("CCS811: failed to restore baseline: %s", e)
 
         # set MEAS_MODE
-        mode_val = {0:0x00, 1:0x10, 2:0x20, 3:0x30, 4:0x40}.get(drive_mode, 0x10)
+        mode_val = _DRIVE_MODE_VALUES[drive_mode] if 0 <= drive_mode < len(_DRIVE_MODE_VALUES) else 0x10
         if interrupt:
             mode_val |= 0x08
         try:
+            # takes effect immediately in application mode; no settle delay needed
             self.bus.write_byte_data(self.address, self.REG_MEAS_MODE, mode_val)
-            time.sleep(0.02)
         except Exception as e:
             raise RuntimeError(f"CCS811 set MEAS_MODE failed: {e}")
 
+    @staticmethod
+    def _load_baseline_file(path):
+        """Return the 2-byte baseline stored in path, or None if missing/invalid."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            data = os.read(fd, 3)  # 3, not 2: an overlong file shows up without a stat()
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+        if len(data) != 2:
+            return None
+        return _BASELINE.unpack_from(data)[0]
+
     def read(self):
-        raw = self._read_block(self.REG_ALG, 8)
-        eco2 = (raw[0] << 8) | raw[1]
-        tvoc = (raw[2] << 8) | raw[3]
-        status = raw[4]
-        error_id = raw[5]
+        if SMBUS2:
+            self._retry_i2c(self.bus.i2c_rdwr, self._alg_reg_msg, self._alg_rd_msg)
+            raw = bytes(self._alg_rd_msg)
+        else:
+            raw = bytes(self._read_block(self.REG_ALG, 8))
+        eco2, tvoc, status, error_id = _ALG.unpack_from(raw)
         return eco2, tvoc, status, error_id, raw
 
     def write_env_data(self, humidity_percent, temp_c):
@@ -267,33 +382,60 @@ class CCS811:
          - temperature: uint16 = round((temp_c + 25) * 512) (1/512 °C with +25 offset)
          - total 4 bytes sent (no CRC)
         """
-        h_raw = int(round(humidity_percent * 512.0)) & 0xFFFF
-        t_raw = int(round((temp_c + 25.0) * 512.0)) & 0xFFFF
-        msb_h = (h_raw >> 8) & 0xFF
-        lsb_h = h_raw & 0xFF
-        msb_t = (t_raw >> 8) & 0xFF
-        lsb_t = t_raw & 0xFF
         try:
-            self._write_block(self.REG_ENV_DATA, [msb_h, lsb_h, msb_t, lsb_t])
+            self._write_block(self.REG_ENV_DATA, self._env_bytes(humidity_percent, temp_c))
         except Exception as e:
             raise RuntimeError(f"Failed to write ENV_DATA to CCS811: {e}")
 
+    @staticmethod
+    def _env_bytes(humidity_percent, temp_c):
+        h_raw = int(round(humidity_percent * 512.0)) & 0xFFFF
+        t_raw = int(round((temp_c + 25.0) * 512.0)) & 0xFFFF
+        return [(h_raw >> 8) & 0xFF, h_raw & 0xFF, (t_raw >> 8) & 0xFF, t_raw & 0xFF]
+
+    def write_env_and_read(self, humidity_percent, temp_c):
+        """
+        Write ENV_DATA and read ALG_RESULT_DATA back-to-back.
+        With smbus2 both go out as one combined i2c_rdwr transfer (repeated start,
+        no STOP/START in between); plain smbus falls back to two transactions.
+        Returns the same tuple as read().
+        """
+        if not SMBUS2:
+            self.write_env_data(humidity_percent, temp_c)
+            return self.read()
+        env = i2c_msg.write(self.address, [self.REG_ENV_DATA] + self._env_bytes(humidity_percent, temp_c))
+        try:
+            self._retry_i2c(self.bus.i2c_rdwr, env, self._alg_reg_msg, self._alg_rd_msg)
+        except OSError as e:
+            # still failing after the retries: split up again, so an ENV_DATA problem is
+            # reported on its own and does not cost the (separately retried) result read
+            self.logger.warning("CCS811 combined ENV_DATA write + read failed: %s", e)
+            try:
+                self.write_env_data(humidity_percent, temp_c)
+            except RuntimeError as e2:
+                self.logger.warning("%s", e2)
+            return self.read()
+        raw = bytes(self._alg_rd_msg)
+        eco2, tvoc, status, error_id = _ALG.unpack_from(raw)
+        return eco2, tvoc, status, error_id, raw
+
     def read_baseline(self):
         b = self._read_block(self.REG_BASELINE, 2)
-        return (b[0] << 8) | b[1]
+        return _BASELINE.unpack_from(bytes(b))[0]
 
     def save_baseline_file(self, path):
         try:
             b = self.read_baseline()
+            if b == self._saved_baseline and path == self.baseline_file:
+                # unchanged since the last save/restore: skip the temp file + fsync + rename
+                self.logger.debug("CCS811 baseline 0x%04X unchanged, not rewriting %s", b, path)
+                return b
             d = os.path.dirname(path)
-            if d and not os.path.exists(d):
+            if d:
                 os.makedirs(d, exist_ok=True)
-            tmp = path + ".tmp"
-            with open(tmp, "wb") as f:
-                f.write(bytes([(b >> 8) & 0xFF, b & 0xFF]))
-                f.flush()
-                os.fsync(f.fileno())
-            os.replace(tmp, path)
+            _write_atomic(path, _BASELINE.pack(b))
+            if path == self.baseline_file:
+                self._saved_baseline = b
             self.logger.info("CCS811 baseline saved: 0x%04X -> %s", b, path)
             return b
         except Exception as e:
@@ -414,14 +556,17 @@ class SensorRunner:
                 del sensor_buffer[0: len(sensor_buffer) - 600]
 
     def _loop(self):
-        last_baseline_save = time.time()
+        last_baseline_save = time.monotonic()
         temp = 22.0
         db = 0.0
 
         # small warmup
         time.sleep(0.2)
+        next_t = time.monotonic()
 
         while self.running:
+            # one clock read per tick; monotonic so wall-clock jumps (NTP) don't trigger/skip saves
+            now = time.monotonic()
             try:
                 # 1) read SCD41 (CO2, temp, humidity)
                 try:
@@ -444,17 +589,13 @@ class SensorRunner:
                         # simulator error unlikely
                         co2_scd, temp_scd, hum_scd = self.scd.read_measurement()
 
-                # 2) write ENV_DATA to CCS811 to improve TVOC accuracy
+                # 2) write ENV_DATA (improves TVOC accuracy) and 3) read CCS811 for TVOC
+                #    (ignore its eCO2) in one combined transfer
                 try:
                     if isinstance(self.ccs, CCS811):
-                        # use humidity percent and temperature C
-                        self.ccs.write_env_data(hum_scd, temp_scd)
-                except Exception as e:
-                    _LOG.warning("Failed to write ENV_DATA to CCS811: %s", e)
-
-                # 3) read CCS811 for TVOC (and ignore its eCO2)
-                try:
-                    eco2_ccs, tvoc, status, errid, raw = self.ccs.read()
+                        eco2_ccs, tvoc, status, errid, raw = self.ccs.write_env_and_read(hum_scd, temp_scd)
+                    else:
+                        eco2_ccs, tvoc, status, errid, raw = self.ccs.read()
                 except Exception as e:
                     _LOG.warning("CCS811 read failed: %s", e)
                     # try re-init once if hardware
@@ -491,18 +632,25 @@ class SensorRunner:
                 self._append_sample(temp, db, co2, voc)
 
                 # periodic baseline save for CCS811
-                if (time.time() - last_baseline_save) >= 3600.0:
+                if (now - last_baseline_save) >= 3600.0:
                     try:
                         if isinstance(self.ccs, CCS811):
                             self.ccs.save_baseline_file(self.baseline_file)
                     except Exception as e:
                         _LOG.warning("Failed to save CCS811 baseline: %s", e)
-                    last_baseline_save = time.time()
+                    last_baseline_save = now
 
             except Exception as e:
                 _LOG.exception("Unhandled exception in sensor loop: %s", e)
 
-            time.sleep(self.poll_interval)
+            # deadline scheduling: the read/re-init time must not add up as drift
+            next_t += self.poll_interval
+            delay = next_t - time.monotonic()
+            if delay <= 0:
+                # fell behind (slow re-init etc.): resync instead of bursting to catch up
+                next_t = time.monotonic()
+                delay = 0
+            time.sleep(delay)
 
 # Module-level runner used by device.py
 _RUNNER = None
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
+import os
 import time
 import smbus
 import errno
+import struct
 import subprocess
+from collections import deque
 
 BUS = 1
 ADDR = 0x5A  # change to 0x5B if your board uses that
@@ -20,6 +23,12 @@ STATUS_DATA_READY = 0x08
 STATUS_ERROR = 0x01
 STATUS_APP_VALID = 0x10
 
+# ALG_RESULT_DATA layout: eCO2 (u16), TVOC (u16), STATUS (u8), ERROR_ID (u8)
+_ALG = struct.Struct(">HHBB")
+
+# upper bound for the exponential EIO retry backoff (seconds)
+MAX_RETRY_DELAY = 0.2
+
 bus = smbus.SMBus(BUS)
 
 def read_reg(addr, reg, retries=3, delay=0.05):
@@ -29,6 +38,7 @@ def read_reg(addr, reg, retries=3, delay=0.05):
         except OSError as e:
             if getattr(e, 'errno', None) == errno.EIO and i < retries - 1:
                 time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
                 continue
             raise
 
@@ -39,15 +49,13 @@ def read_block(addr, reg, length, retries=3, delay=0.05):
         except OSError as e:
             if getattr(e, 'errno', None) == errno.EIO and i < retries - 1:
                 time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
                 continue
             raise
 
 def read_alg_results(addr):
     data = read_block(addr, REG_ALG_RESULT_DATA, 8)
-    eco2 = (data[0] << 8) | data[1]
-    tvoc = (data[2] << 8) | data[3]
-    status = data[4]
-    error_id = data[5]
+    eco2, tvoc, status, error_id = _ALG.unpack_from(bytes(data))
     return eco2, tvoc, status, error_id, data
 
 def init_and_start(addr):
@@ -76,15 +84,37 @@ def try_reinit(addr):
         print("Re-init failed:", e)
         return False
 
+def _read_kmsg_tail(n=30):
+    """Return the last n kernel log messages from /dev/kmsg without blocking."""
+    tail = deque(maxlen=n)
+    with open('/dev/kmsg', 'rb', buffering=0) as f:
+        os.set_blocking(f.fileno(), False)
+        while True:
+            try:
+                rec = f.read(8192)  # one record per read()
+            except BlockingIOError:
+                break
+            except BrokenPipeError:
+                continue  # records were overwritten while reading; skip ahead
+            if not rec:
+                break
+            # record format: "prio,seq,ts_usec,flags;message\n"
+            tail.append(rec.split(b';', 1)[-1].decode(errors='ignore').rstrip())
+    return tail
+
 def show_recent_dmesg():
     try:
-        out = subprocess.check_output(["dmesg", "--ctime", "--kernel", "--follow=false"], stderr=subprocess.DEVNULL)
-        lines = out.decode(errors='ignore').splitlines()
-        for l in lines[-30:]:
-            if 'i2c' in l.lower() or 'bcm' in l.lower():
-                print("dmesg:", l)
-    except Exception:
-        pass
+        lines = _read_kmsg_tail(30)
+    except OSError:
+        # /dev/kmsg not readable (permissions / non-Linux): fall back to dmesg
+        try:
+            out = subprocess.check_output(["dmesg", "--ctime", "--kernel", "--follow=false"], stderr=subprocess.DEVNULL)
+            lines = out.decode(errors='ignore').splitlines()[-30:]
+        except Exception:
+            return
+    for l in lines:
+        if 'i2c' in l.lower() or 'bcm' in l.lower():
+            print("dmesg:", l)
 
 if __name__ == "__main__":
     try:
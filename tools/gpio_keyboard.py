@@ -1,6 +1,6 @@
 import RPi.GPIO as GPIO
 import uinput
-import time
+import signal
 
 # Set up GPIO
 GPIO.setmode(GPIO.BCM)
@@ -15,10 +15,14 @@ except FileNotFoundError:
     print("uinput device not found. Make sure it's enabled in /boot/config.txt")
     exit()
 
-# Event loop
-while True:
-    if GPIO.input(button_pin) == GPIO.LOW:
-        print("Button pressed")
-        device.emit(uinput.KEY_A, 1)  # Send a keystroke (e.g., 'A')
-        time.sleep(0.5)  # Debounce to prevent multiple presses
-    time.sleep(0.01)
+# Event handling: the kernel signals the falling edge, no polling loop needed
+def _on_press(channel):
+    print("Button pressed")
+    device.emit_click(uinput.KEY_A)  # Send a keystroke (e.g., 'A')
+
+GPIO.add_event_detect(button_pin, GPIO.FALLING, callback=_on_press, bouncetime=500)  # bouncetime = debounce in ms
+
+try:
+    signal.pause()
+finally:
+    GPIO.cleanup(button_pin)
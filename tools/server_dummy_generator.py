@@ -1,24 +1,76 @@
+import io
 import os
 import json
 import random
+import tarfile
+import time
+import argparse
 from datetime import datetime, timedelta
 
+# orjson (optional) serialisiert deutlich schneller als das json-Modul
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Kirill_Website/common/server_data")
 os.makedirs(BASE_DIR, exist_ok=True)
 
+# Tagesordner, die in diesem Lauf schon angelegt wurden (4 Uploads teilen sich einen)
+_DIR_CACHE = set()
+
+# Optionales Tar-Archiv (--tar): alle JSON-Dateien landen in einer Datei statt in
+# tausenden kleinen Dateien auf der SD-Karte
+_TAR = None
+
+
+# Encoder bzw. Optionen einmal anlegen statt bei jedem dumps()-Aufruf.
+# Beide Wege liefern dasselbe Format (orjson kennt nur 2er-Einrückung, schreibt UTF-8 roh),
+# damit die Dateien nicht davon abhängen, ob orjson installiert ist.
+_ORJSON_OPT = orjson.OPT_INDENT_2 if orjson is not None else 0
+_ENCODE = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+
 
 # --- Funktionen zum Speichern ---
-def save_upload(year, month, day, upload_number, good, meh, bad, upload_ts, avg_sensor):
+def _tar_write(tf, arcname, data_bytes):
+    info = tarfile.TarInfo(arcname)
+    info.size = len(data_bytes)
+    info.mtime = time.time()  # wie eine normal geschriebene Datei (TarInfo-Default wäre 1970)
+    tf.addfile(info, io.BytesIO(data_bytes))
+
+
+def _write_json(path, data):
+    if orjson is not None:
+        buf = orjson.dumps(data, option=_ORJSON_OPT)
+    else:
+        # json.dump schreibt Token für Token; encode + ein write() ist viel schneller
+        buf = _ENCODE(data).encode("utf-8")
+    if _TAR is not None:
+        _tar_write(_TAR, os.path.relpath(path, BASE_DIR), buf)
+        return
+    with open(path, "wb") as f:
+        f.write(buf)
+
+
+def save_upload(year, month, day, upload_number, good, meh, bad, upload_dt, avg_sensor):
     dir_path = os.path.join(BASE_DIR, year, month, day)
-    os.makedirs(dir_path, exist_ok=True)
+    if _TAR is None and dir_path not in _DIR_CACHE:
+        os.makedirs(dir_path, exist_ok=True)
+        _DIR_CACHE.add(dir_path)
 
-    dt_obj = datetime.strptime(upload_ts, "%Y-%m-%d %H:%M:%S")
+    # upload_dt kommt als datetime rein: kein strptime-Umweg über den String
+    dt_obj = upload_dt
+    upload_ts = dt_obj.strftime("%Y-%m-%d %H:%M:%S")
     sensor_window_start = (dt_obj - timedelta(seconds=random.randint(2, 10))).strftime("%Y-%m-%d %H:%M:%S")
     sensor_window_end = (dt_obj + timedelta(seconds=random.randint(1, 5))).strftime("%Y-%m-%d %H:%M:%S")
 
+    # kein shuffle: jedes Event trägt seinen eigenen Zeitstempel, die Reihenfolge ist egal
     event_types = ["good"] * good + ["meh"] * meh + ["bad"] * bad
-    random.shuffle(event_types)
-    events = [{"type": t, "timestamp": (dt_obj - timedelta(seconds=random.randint(0, 600))).timestamp()} for t in event_types]
+    # Zeitstempel einmal berechnen, pro Event nur noch den Offset abziehen
+    # (statt timedelta + .timestamp() für jedes einzelne Event)
+    base_ts = dt_obj.timestamp()
+    randint = random.randint
+    events = [{"type": t, "timestamp": base_ts - randint(0, 600)} for t in event_types]
 
     data = {
         "upload_number": upload_number,
@@ -33,51 +85,19 @@ def save_upload(year, month, day, upload_number, good, meh, bad, upload_ts, avg_
     }
 
     file_path = os.path.join(dir_path, f"upload{upload_number}.json")
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=4)
+    _write_json(file_path, data)
 
     return dir_path
 
 
-def update_totals(dir_path, good, meh, bad, avg_sensor):
+def write_totals(dir_path, totals, date_obj):
+    """Schreibt die fertig aufsummierten Tageswerte einmal pro Tag nach totals.json."""
     totals_file = os.path.join(dir_path, "totals.json")
-    if os.path.exists(totals_file):
-        with open(totals_file, "r") as f:
-            try:
-                totals = json.load(f)
-            except:
-                totals = {"good": 0, "meh": 0, "bad": 0,
-                          "avg_sensor_day": {"temp": 0, "db": 0, "co2": 0, "voc": 0, "count": 0},
-                          "weekday": ""}
-    else:
-        totals = {"good": 0, "meh": 0, "bad": 0,
-                  "avg_sensor_day": {"temp": 0, "db": 0, "co2": 0, "voc": 0, "count": 0},
-                  "weekday": ""}
-
-    totals["good"] += good
-    totals["meh"] += meh
-    totals["bad"] += bad
-
-    # Durchschnittswerte des Tages gleitend aktualisieren
-    c = totals["avg_sensor_day"].get("count", 0)
-    totals["avg_sensor_day"]["temp"] = (totals["avg_sensor_day"]["temp"] * c + avg_sensor["temp"]) / (c + 1)
-    totals["avg_sensor_day"]["db"] = (totals["avg_sensor_day"]["db"] * c + avg_sensor["db"]) / (c + 1)
-    totals["avg_sensor_day"]["co2"] = (totals["avg_sensor_day"]["co2"] * c + avg_sensor["co2"]) / (c + 1)
-    totals["avg_sensor_day"]["voc"] = (totals["avg_sensor_day"]["voc"] * c + avg_sensor["voc"]) / (c + 1)
-    totals["avg_sensor_day"]["count"] = c + 1
-
-    # Wochentag aus dem Ordnernamen berechnen
-    try:
-        year = int(os.path.basename(os.path.dirname(os.path.dirname(dir_path))))
-        month = int(os.path.basename(os.path.dirname(dir_path)))
-        day = int(os.path.basename(dir_path))
-        date_obj = datetime(year, month, day)
-        totals["weekday"] = date_obj.strftime("%A")  # z.B. "Monday", oder auf Deutsch bei Locale
-    except:
-        totals["weekday"] = "?"
-
-    with open(totals_file, "w") as f:
-        json.dump(totals, f, indent=4)
+
+    # Datum kommt vom Aufrufer, kein Zurückrechnen aus dem Ordnernamen
+    totals["weekday"] = date_obj.strftime("%A")  # z.B. "Monday", oder auf Deutsch bei Locale
+
+    _write_json(totals_file, totals)
 
 
 # --- Monatsbasierte Maximalwerte ---
@@ -87,6 +107,9 @@ MONTH_MAX_VOTES = {
     7: (90, 150), 8: (80, 140), 9: (60, 120),
     10: (50, 110), 11: (40, 90), 12: (30, 80)
 }
+# als Tupel nach Monat-1 indiziert (kein dict.get pro Tag)
+_MONTH_VOTES = tuple(MONTH_MAX_VOTES[m] for m in range(1, 13))
+_UPLOAD_HOURS = (9, 12, 15, 18)
 
 
 # --- Dummy-Daten Generator ---
@@ -94,41 +117,68 @@ def generate_dummy_data():
     start_date = datetime(2025, 1, 1)
     end_date = datetime.today()
     current_date = start_date
+    # Zufallsfunktionen einmal lokal binden (spart den Attribut-Lookup pro Aufruf)
+    randint = random.randint
+    uniform = random.uniform
 
     while current_date <= end_date:
         year = current_date.strftime("%Y")
         month = current_date.month
         day = current_date.strftime("%d")
 
-        min_votes, max_votes = MONTH_MAX_VOTES.get(month, (50, 140))
-        total_votes = random.randint(min_votes, max_votes)
+        min_votes, max_votes = _MONTH_VOTES[month - 1]
+        total_votes = randint(min_votes, max_votes)
         remaining = total_votes
 
+        # Tagessummen im Speicher sammeln, totals.json nur einmal pro Tag schreiben
+        day_good = day_meh = day_bad = 0
+        sensor_sum = {"temp": 0.0, "db": 0.0, "co2": 0.0, "voc": 0.0}
+        count = 0
+
         for upload_number in range(1, 5):
-            good = random.randint(0, remaining)
-            meh = random.randint(0, remaining - good)
+            good = randint(0, remaining)
+            meh = randint(0, remaining - good)
             bad = remaining - good - meh
             if bad < 0: bad = 0
 
             avg_sensor = {
-                "temp": round(random.uniform(20.0, 25.0), 1),
-                "db": round(random.uniform(35.0, 55.0), 1),
-                "co2": random.randint(390, 430),
-                "voc": random.randint(5, 20)
+                "temp": round(uniform(20.0, 25.0), 1),
+                "db": round(uniform(35.0, 55.0), 1),
+                "co2": randint(390, 430),
+                "voc": randint(5, 20)
             }
 
-            upload_ts = current_date.replace(
-                hour=[9, 12, 15, 18][upload_number - 1],
+            upload_dt = current_date.replace(
+                hour=_UPLOAD_HOURS[upload_number - 1],
                 minute=15,
-                second=random.randint(0, 59)
-            ).strftime('%Y-%m-%d %H:%M:%S')
+                second=randint(0, 59)
+            )
+
+            dir_path = save_upload(year, f"{month:02}", day, upload_number, good, meh, bad, upload_dt, avg_sensor)
 
-            dir_path = save_upload(year, f"{month:02}", day, upload_number, good, meh, bad, upload_ts, avg_sensor)
-            update_totals(dir_path, good, meh, bad, avg_sensor)
+            day_good += good
+            day_meh += meh
+            day_bad += bad
+            for k in sensor_sum:
+                sensor_sum[k] += avg_sensor[k]
+            count += 1
+
+        avg_sensor_day = {k: v / count for k, v in sensor_sum.items()}
+        avg_sensor_day["count"] = count
+        write_totals(dir_path, {"good": day_good, "meh": day_meh, "bad": day_bad,
+                                "avg_sensor_day": avg_sensor_day}, current_date)
 
         current_date += timedelta(days=1)
 
 
 if __name__ == "__main__":
-    generate_dummy_data()
+    parser = argparse.ArgumentParser(description="SIA Dummy-Daten Generator")
+    parser.add_argument("--tar", action="store_true",
+                        help="alles in BASE_DIR/dummy.tar schreiben statt einzelner Dateien")
+    args = parser.parse_args()
+    if args.tar:
+        with tarfile.open(os.path.join(BASE_DIR, "dummy.tar"), "w") as _TAR:
+            generate_dummy_data()
+    else:
+        generate_dummy_data()
     print("✅ Dummy-Daten mit Sensorwerten und Wochentagen erstellt (2025 bis heute).")
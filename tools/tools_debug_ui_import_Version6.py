@@ -14,6 +14,7 @@
 # This is a read-only helper; it does not call ui.run or start Pygame.
 
 import os
+import re
 import sys
 import importlib
 import inspect
@@ -21,6 +22,10 @@ import traceback
 from pathlib import Path
 
 PRINT_SOURCE_LINES = 80
+# directories never worth searching for ui.py
+_SKIP_DIRS = {".git", "__pycache__", "venv", ".venv", "node_modules"}
+# "import device" / "from device import ..." at the start of a line
+_DEVICE_IMPORT_RE = re.compile(rb"^\s*(from|import)\s+device\b", re.M)
 
 def print_header(title):
     print("\n" + "="*80)
@@ -36,18 +41,13 @@ def list_sys_path():
 def find_local_ui_file():
     print_header("Looking for ui.py files in project tree (project root and immediate files)")
     cwd = Path.cwd()
-    candidates = list(cwd.glob("ui.py")) + list(cwd.glob("*/ui.py")) + list(cwd.glob("**/ui.py"))
-    # deduplicate by resolved path
-    seen = set()
+    # one directory walk instead of three overlapping globs ("**/ui.py" already covers the others);
+    # os.walk visits every directory once, so no dedup pass is needed
     unique = []
-    for p in candidates:
-        try:
-            rp = str(p.resolve())
-        except Exception:
-            rp = str(p)
-        if rp not in seen:
-            seen.add(rp)
-            unique.append(p)
+    for root, dirs, files in os.walk(cwd):
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
+        if "ui.py" in files:
+            unique.append(Path(root) / "ui.py")
     if not unique:
         print("No ui.py found under project root (cwd).")
     else:
@@ -84,34 +84,26 @@ def import_and_inspect_ui():
     except Exception:
         traceback.print_exc()
 
-    # Try to read the source file and show first lines for inspection
+    # Read the source once (bytes): used for the listing and for the import heuristic
     ui_file = getattr(ui, "__file__", None)
+    ui_lines = None
     if ui_file:
+        print_header(f"First {PRINT_SOURCE_LINES} lines of {ui_file}")
         try:
-            print_header(f"First {PRINT_SOURCE_LINES} lines of {ui_file}")
-            with open(ui_file, "r", encoding="utf-8", errors="replace") as f:
-                for i, line in enumerate(f):
-                    if i >= PRINT_SOURCE_LINES:
-                        break
-                    # show line number and content
-                    print(f"{i+1:03d}: {line.rstrip()}")
+            ui_lines = Path(ui_file).read_bytes().splitlines()
         except Exception as e:
             print("Failed to read ui file:", e)
+    if ui_lines is not None:
+        for i, line in enumerate(ui_lines[:PRINT_SOURCE_LINES]):
+            # show line number and content
+            print(f"{i+1:03d}: {line.decode('utf-8', 'replace').rstrip()}")
 
-    # Heuristic: check if ui source imports device at top-level (possible circular import)
-    if ui_file:
-        try:
-            with open(ui_file, "r", encoding="utf-8", errors="replace") as f:
-                top = "".join([next(f) for _ in range(40)])  # first ~40 lines
-            if "import device" in top or "from device" in top:
-                print_header("Potential circular import warning")
-                print("ui.py appears to import device at module level (first ~40 lines).")
-                print("This can cause a circular import: device -> ui and ui -> device.")
-                print("If ui imports device at top-level, move that import inside run() or remove it and use callbacks.")
-        except StopIteration:
-            pass
-        except Exception:
-            pass
+        # Heuristic: check if ui source imports device at top-level (possible circular import)
+        if _DEVICE_IMPORT_RE.search(b"\n".join(ui_lines[:40])):  # first ~40 lines
+            print_header("Potential circular import warning")
+            print("ui.py appears to import device at module level (first ~40 lines).")
+            print("This can cause a circular import: device -> ui and ui -> device.")
+            print("If ui imports device at top-level, move that import inside run() or remove it and use callbacks.")
 
     return ui
 
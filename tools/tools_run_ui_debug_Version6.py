@@ -2,9 +2,12 @@
 # Debug runner: directly calls ui.run with device callbacks and logs entry/exit.
 # Run from project root: python tools/run_ui_debug.py
 
+import inspect
 import logging
 import time
 import sys
+from collections import namedtuple
+from operator import attrgetter
 from pathlib import Path
 
 # ensure project root is on sys.path (should be automatically when run from project root)
@@ -25,32 +28,30 @@ except Exception as e:
 # Sanity checks
 _LOG.info("Imported device from: %s", getattr(device, "__file__", "<unknown>"))
 _LOG.info("Imported ui from: %s", getattr(ui, "__file__", "<unknown>"))
-_LOG.info("ui.run exists: %s", hasattr(ui, "run"))
-
-# Verify ui.run signature
+# Look up ui.run and its signature once; reused below for logging and the call
+ui_run = getattr(ui, "run", None)
 try:
-    import inspect
-    if hasattr(ui, "run"):
-        _LOG.info("ui.run signature: %s", inspect.signature(ui.run))
-except Exception:
-    pass
+    ui_run_sig = inspect.signature(ui_run) if ui_run is not None else None
+except (TypeError, ValueError):
+    ui_run_sig = None
+_LOG.info("ui.run exists: %s", ui_run is not None)
+if ui_run_sig is not None:
+    _LOG.info("ui.run signature: %s", ui_run_sig)
 
-# Prepare callbacks to pass (use device's functions)
-callbacks = {
-    "get_counts": getattr(device, "get_counts", None),
-    "get_override_info": getattr(device, "get_override_info", None),
-    "get_upload_info": getattr(device, "get_upload_info", None),
-    "get_latest_sensor": getattr(device, "get_latest_sensor", None),
-    "calculate_avg_smiley": getattr(device, "calculate_avg_smiley", None),
-    "pct_round": getattr(device, "pct_round", None),
-    "on_vote": getattr(device, "on_vote", None),
-    "on_upload": getattr(device, "on_upload", None),
-}
+# Prepare callbacks to pass (use device's functions), in ui.run's positional order
+Callbacks = namedtuple("Callbacks", "get_counts get_override_info get_upload_info get_latest_sensor "
+                                    "calculate_avg_smiley pct_round on_vote on_upload")
+try:
+    # one attrgetter call resolves all names at once
+    cbs = Callbacks(*attrgetter(*Callbacks._fields)(device))
+except AttributeError:
+    # at least one is missing: resolve one by one so we can report which
+    cbs = Callbacks(*(getattr(device, f, None) for f in Callbacks._fields))
 
-_LOG.info("Callbacks prepared; existence: %s", {k: (v is not None) for k, v in callbacks.items()})
+_LOG.info("Callbacks prepared; existence: %s", {f: (v is not None) for f, v in zip(Callbacks._fields, cbs)})
 
 # Check we have all callbacks
-missing = [k for k, v in callbacks.items() if v is None]
+missing = [f for f, v in zip(Callbacks._fields, cbs) if v is None]
 if missing:
     _LOG.error("Missing callbacks in device module: %s", missing)
     print("Please ensure device.py exports these functions. Exiting.")
@@ -60,16 +61,7 @@ if missing:
 try:
     _LOG.info("Entering ui.run (UI should open now). Close the window to continue.")
     start = time.time()
-    ui.run(
-        callbacks["get_counts"],
-        callbacks["get_override_info"],
-        callbacks["get_upload_info"],
-        callbacks["get_latest_sensor"],
-        callbacks["calculate_avg_smiley"],
-        callbacks["pct_round"],
-        callbacks["on_vote"],
-        callbacks["on_upload"],
-    )
+    ui_run(*cbs)
     duration = time.time() - start
     _LOG.info("ui.run returned after %.1f seconds", duration)
 except Exception as e:
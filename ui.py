@@ -16,6 +16,7 @@ import pygame
 import time
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 _LOG = logging.getLogger("ui")
 
@@ -23,6 +24,17 @@ _LOG = logging.getLogger("ui")
 HERE = os.path.dirname(os.path.abspath(__file__))
 MEDIA_DIR = os.path.join(HERE, "Media")
 
+# Farben einmal als Konstanten (statt Tupel-Literale in jedem Render-Aufruf)
+WHITE = (255,255,255)
+BLACK = (0,0,0)
+GREEN = (0,255,0)
+YELLOW = (255,200,0)
+RED = (255,0,0)
+RED_WARN = (255,50,50)
+
+# Smiley-Art -> Index in die (bad, meh, good)-Tupel; unbekannte Arten zählen als meh (1)
+KIND_IDX = {"bad": 0, "meh": 1, "good": 2}
+
 def _debug_media_listing():
     try:
         if os.path.isdir(MEDIA_DIR):
@@ -55,10 +67,12 @@ def load_font(path, size):
         _LOG.warning("Font %s nicht gefunden (resolved: %s), benutze Default-Font.", path, candidate)
         return pygame.font.SysFont(None, size)
 
-def load_image(path, fallback_color, size=None):
+def load_image(path, fallback_color, size=None, decoded=None):
     """
     Try to load an image. Relative paths are resolved under MEDIA_DIR.
     CHANGED: resolve and log.
+    decoded: optional Future of pygame.image.load() started earlier in a worker thread;
+    convert_alpha/smoothscale always happen here (main thread, after set_mode).
     """
     # Resolve relative paths under MEDIA_DIR
     if not os.path.isabs(path):
@@ -66,9 +80,11 @@ def load_image(path, fallback_color, size=None):
     else:
         candidate = path
     try:
-        img = pygame.image.load(candidate).convert_alpha()
+        raw = decoded.result() if decoded is not None else pygame.image.load(candidate)
+        img = raw.convert_alpha()
         if size is not None:
-            img = pygame.transform.smoothscale(img, size)
+            # smoothscale liefert nicht zwingend das Display-Format: erneut konvertieren
+            img = pygame.transform.smoothscale(img, size).convert_alpha()
         return img
     except Exception:
         _LOG.warning("Bild %s nicht gefunden (resolved: %s), benutze Platzhalter.", path, candidate)
@@ -81,7 +97,74 @@ def load_image(path, fallback_color, size=None):
         w, h = size if size is not None else (200,200)
         surf = pygame.Surface((w, h), pygame.SRCALPHA)
         surf.fill(fallback_color)
-        return surf
+        return surf.convert_alpha()
+
+# Gerenderte Zahlen/Texte, Schlüssel (id(font), text, color). Zähler und Sensorwerte
+# ändern sich selten, meist ist es ein Treffer. FIFO-Begrenzung auf _RENDER_CACHE_MAX.
+# Gilt nur für einen run()-Aufruf: Fonts/Labels entstehen in run(), ihre id()s können
+# beim nächsten Aufruf wiederverwendet werden -> run() leert den Cache am Anfang und Ende.
+_RENDER_CACHE = {}
+_RENDER_CACHE_MAX = 256
+
+def _cache_put(key, surf):
+    if len(_RENDER_CACHE) >= _RENDER_CACHE_MAX:
+        del _RENDER_CACHE[next(iter(_RENDER_CACHE))]  # ältesten Eintrag verwerfen
+    _RENDER_CACHE[key] = surf
+
+def _cached_render(font, text, color):
+    key = (id(font), text, color)
+    surf = _RENDER_CACHE.get(key)
+    if surf is None:
+        surf = font.render(text, True, color).convert_alpha()
+        _cache_put(key, surf)
+    return surf
+
+def _cached_row(font, label, label_w, text, color):
+    """
+    Label-Surface + gerenderter Wert (ab label_w + 8) als eine Surface, damit eine
+    Zeile nur einen Blit kostet. Gecacht wie _cached_render.
+    """
+    key = (id(label), label_w, text, color)
+    surf = _RENDER_CACHE.get(key)
+    if surf is None:
+        val = _cached_render(font, text, color)
+        surf = pygame.Surface((label_w + 8 + val.get_width(), max(label.get_height(), val.get_height())),
+                              pygame.SRCALPHA).convert_alpha()
+        surf.blit(label, (0, 0))
+        surf.blit(val, (label_w + 8, 0))
+        _cache_put(key, surf)
+    return surf
+
+# Fertig skalierte Smileys als rohe RGBA-Bytes (Media/cache/<name>_<w>x<h>.rgba).
+# Rohdaten laden ist viel schneller als PNG dekodieren + smoothscale; ungültig, sobald
+# die Quell-PNG neuer ist.
+CACHE_DIR = os.path.join(MEDIA_DIR, "cache")
+_tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+def _rgba_cache_path(name, size):
+    return os.path.join(CACHE_DIR, "%s_%dx%d.rgba" % (os.path.splitext(name)[0], size[0], size[1]))
+
+def _read_rgba_cache(name, size):
+    """Return the cached Surface (not yet converted) or None if missing/stale."""
+    path = _rgba_cache_path(name, size)
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(os.path.join(MEDIA_DIR, name)):
+            return None
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    if len(raw) != size[0] * size[1] * 4:
+        return None
+    return pygame.image.frombuffer(raw, size, "RGBA")
+
+def _write_rgba_cache(name, surf):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_rgba_cache_path(name, surf.get_size()), "wb") as f:
+            f.write(_tobytes(surf, "RGBA"))
+    except OSError as e:
+        _LOG.debug("Smiley-Cache nicht schreibbar (%s): %s", CACHE_DIR, e)
 
 def _normalize_latest(latest):
     """
@@ -89,18 +172,17 @@ def _normalize_latest(latest):
     Return (temp, db, co2, voc).
     """
     try:
-        if latest is None:
-            raise ValueError
-        # dataclass-like
-        if hasattr(latest, "temp"):
-            temp = float(getattr(latest, "temp", 22.0))
-            db   = float(getattr(latest, "db", 0.0))
-            co2  = int(getattr(latest, "co2", 410))
-            voc  = int(getattr(latest, "voc", 10))
-            return temp, db, co2, voc
-    except Exception:
+        # Normalfall: Objekt mit allen vier Attributen, direkter Zugriff ohne hasattr/getattr
+        return float(latest.temp), float(latest.db), int(latest.co2), int(latest.voc)
+    except AttributeError:
         pass
+    except (TypeError, ValueError):
+        return 22.0, 0.0, 410, 10
     try:
+        if hasattr(latest, "temp"):
+            # Objekt mit fehlenden Feldern (z.B. SCD41-SensorSample ohne db/voc)
+            return (float(latest.temp), float(getattr(latest, "db", 0.0)),
+                    int(getattr(latest, "co2", 410)), int(getattr(latest, "voc", 10)))
         # tuple-like fallback
         temp, db, co2, voc = latest
         return float(temp), float(db), int(co2), int(voc)
@@ -118,47 +200,187 @@ def run(get_counts,
     """
     Startet die Pygame-Loop. Blockierend. Gibt zurück, wenn der Nutzer
     das Fenster schließt (oder QUIT auslöst).
+    Die Zeitstempel aus get_override_info/get_upload_info sind time.monotonic()-Werte.
     """
     pygame.init()
+    _RENDER_CACHE.clear()
 
     # Log debug info about where Media is expected
     _LOG.info("ui: using MEDIA_DIR = %s", MEDIA_DIR)
     _debug_media_listing()
 
+    # PNG-Dekodierung in Worker-Threads starten, läuft parallel zu set_mode und Font-Laden
+    # (SD-Karte am Pi ist langsam). Nur load() im Thread, convert erst nach set_mode.
+    # Smileys mit gültigem RGBA-Cache brauchen gar keine PNG-Dekodierung.
+    preload = ThreadPoolExecutor(max_workers=3)
+    cached = {}
+    decoded = {}
+    for name in ("good.png", "meh.png", "bad.png"):
+        big = _read_rgba_cache(name, (200,200))
+        small = _read_rgba_cache(name, (48,48))
+        if big is not None and small is not None:
+            cached[name] = (big, small)
+        else:
+            decoded[name] = preload.submit(pygame.image.load, os.path.join(MEDIA_DIR, name))
+
+    # Bewusst ohne SCALED/vsync: vsync gibt es in pygame 2 nur mit SCALED (oder OPENGL),
+    # dann präsentiert ein SDL-Renderer und display.update(dirty_rects) kopiert trotzdem
+    # das ganze Bild -> die Dirty-Rect-Updates unten wären wirkungslos. Außerdem kann
+    # SCALED das Fenster auf Desktop-Displays vergrößern.
     screen = pygame.display.set_mode((1024, 600))
     pygame.display.set_caption("Smiley + Sensoranzeige")
-    clock = pygame.time.Clock()
+    # Fenstergröße ist fix: Maße und abgeleitete Layout-Punkte einmal bestimmen
+    SW, SH = screen.get_size()
+    CENTER_X = SW // 2
+    BIG_CENTER = (CENTER_X, SH//2 - 50)
+    # Mood-Block links unten (same baseline as original), Sensoren bevorzugt etwas höher
+    MOOD_X = 40
+    MOOD_Y = SH - 150
+    MOOD_GAP = 12
+    SENSOR_Y_PREF = MOOD_Y - 20
 
     # CHANGED: pass relative paths; load_font/load_image will resolve them under MEDIA_DIR
     sensor_font = load_font(os.path.join("Silkscreen", "Silkscreen-Regular.ttf"), 28)
     mood_font = load_font(os.path.join("Silkscreen", "Silkscreen-Regular.ttf"), 28)
 
     # Lade grosse Smileys (200x200) und kleine Varianten (48x48)
-    big_good = load_image("good.png", (0,255,0), size=(200,200))
-    big_meh  = load_image("meh.png", (255,200,0), size=(200,200))
-    big_bad  = load_image("bad.png", (255,0,0), size=(200,200))
-    small_good = pygame.transform.smoothscale(big_good, (48,48))
-    small_meh  = pygame.transform.smoothscale(big_meh,  (48,48))
-    small_bad  = pygame.transform.smoothscale(big_bad,  (48,48))
+    def load_smiley(name, fallback_color):
+        if name in cached:
+            big, small = cached[name]
+            return big.convert_alpha(), small.convert_alpha()
+        fut = decoded[name]
+        big = load_image(name, fallback_color, size=(200,200), decoded=fut)
+        small = pygame.transform.smoothscale(big, (48,48)).convert_alpha()
+        if fut.exception() is None:  # Platzhalter nicht cachen
+            _write_rgba_cache(name, big)
+            _write_rgba_cache(name, small)
+        return big, small
+
+    big_good, small_good = load_smiley("good.png", GREEN)
+    big_meh,  small_meh  = load_smiley("meh.png", YELLOW)
+    big_bad,  small_bad  = load_smiley("bad.png", RED)
+    preload.shutdown(wait=False)
+
+    # Der große Smiley steht auf schwarzem Grund: einmal auf Schwarz vorkomponieren und
+    # ohne Per-Pixel-Alpha konvertieren, dann nimmt SDL den schnellen RGB->RGB-Blit
+    def opaque(surf):
+        flat = pygame.Surface(surf.get_size())
+        flat.fill(BLACK)
+        flat.blit(surf, (0, 0))
+        return flat.convert()
+
+    # nach KIND_IDX bzw. Score-Segment indiziert: 0 = bad, 1 = meh, 2 = good
+    big_by_idx = (opaque(big_bad), opaque(big_meh), opaque(big_good))
+    small_by_idx = (small_bad, small_meh, small_good)
+    kind_to_score = {"good": 1.0, "bad": -1.0}
+
+    # Statische Texte nur einmal rendern; im Loop werden nur noch die Zahlen gerendert
+    lbl_bad = sensor_font.render("Schlecht", True, WHITE).convert_alpha()
+    lbl_meh = sensor_font.render("Neutral", True, WHITE).convert_alpha()
+    lbl_good = sensor_font.render("Gut", True, WHITE).convert_alpha()
+    mood_label_surfs = [mood_font.render(lbl, True, WHITE).convert_alpha()
+                        for lbl in ("Gut:", "Neutral:", "Schlecht:")]
+    sensor_label_surfs = [sensor_font.render(lbl, True, WHITE).convert_alpha()
+                          for lbl in ("Temperatur:", "Dezibel:", "CO2:", "VOC:")]
+    upload_failed_text = sensor_font.render("Upload fehlgeschlagen!", True, RED_WARN).convert_alpha()
+    max_label_w = max(s.get_width() for s in mood_label_surfs)
+    max_label_h = max(s.get_height() for s in mood_label_surfs)
+    max_sensor_label_w = max(s.get_width() for s in sensor_label_surfs)
+    mood_lbl_good, mood_lbl_meh, mood_lbl_bad = mood_label_surfs
+
+    # Skala-Geometrie ist konstant (fixe Fenstergröße)
+    left_margin = 110
+    right_margin = SW - 110
+    y = SH//2 - 270
+
+    # Statischer Hintergrund: Schwarz + Skala (Linie + 3 Labels) einmal in eine
+    # bildschirmgroße Surface zeichnen. Gelöscht wird pro Frame durch Zurückkopieren
+    # aus dem Hintergrund, die Skala muss dann nie neu gezeichnet werden.
+    background = pygame.Surface((SW, SH)).convert()
+    background.fill(BLACK)
+    pygame.draw.line(background, WHITE, (left_margin, y), (right_margin, y), 4)
+    background.blit(lbl_bad,  ((left_margin - lbl_bad.get_width()//2) + 40, y + 12))
+    background.blit(lbl_meh,  ((left_margin+right_margin)//2 - lbl_meh.get_width()//2, y + 12))
+    background.blit(lbl_good, (right_margin - lbl_good.get_width()//2, y + 12))
+
+    upload_failed_pos = (CENTER_X - upload_failed_text.get_width()//2, 50)
+    # alle kleinen Smileys sind 48x48, alle großen 200x200 -> ein fester Ziel-Rect
+    sw, sh = small_good.get_size()
+    big_rect = big_good.get_rect(center=BIG_CENTER)
+    # Kleiner Smiley: Score -1..1 -> linke obere Ecke auf der Skala, Offsets einmal vorrechnen
+    SLIDER_HALF_SPAN = (right_margin - left_margin) / 2.0
+    small_x0 = left_margin - sw//2
+    small_y = y - sh//2
+
+    # Dirty rects: nach dem ersten vollen Frame werden nur noch die Bereiche gelöscht und
+    # an das Display geschickt, in die (letztes oder dieses Frame) dynamisch gezeichnet wurde
+    full_redraw = True
+    # Zwei Rect-Listen, die jedes Frame getauscht und geleert statt neu angelegt werden
+    prev_dirty = []
+    dirty = []
+    # Zuletzt gezeichneter Zustand: unverändert -> Frame komplett überspringen
+    last_state = None
+    # Sensorwerte, aus denen die Anzeigetexte zuletzt gebaut wurden
+    last_sensor = None
+    # Stimmenzahlen, für die pct_round zuletzt gerechnet wurde
+    last_counts = None
+
+    # Statt clock.tick(30) zu pollen blockiert der Loop in event.wait(); ein SDL-Timer
+    # liefert den Render-Takt (~30/s), Tasten wecken sofort. Pro Wecken werden alle
+    # anstehenden Events abgearbeitet und höchstens einmal gezeichnet.
+    RENDER_TICK = pygame.USEREVENT + 1
+    pygame.time.set_timer(RENDER_TICK, 33)
+
+    # Maus/Touch/Fenster-Events brauchen wir nicht: schon in SDL verwerfen, dann wecken
+    # sie event.wait() nicht und es entstehen keine Python-Event-Objekte dafür.
+    # (Kein Typfilter in event.get(): ungefilterte Events blieben sonst in der Queue
+    # liegen und event.wait() käme sofort wieder zurück.)
+    pygame.event.set_blocked([pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                              pygame.MOUSEWHEEL, pygame.FINGERMOTION, pygame.FINGERDOWN,
+                              pygame.FINGERUP, pygame.ACTIVEEVENT, pygame.VIDEORESIZE,
+                              pygame.KEYUP, pygame.TEXTINPUT])
+
+    # Tastenbelegung als Lookup-Tabelle statt if/elif-Kette
+    key_handlers = {
+        pygame.K_g: lambda: on_vote("good"),
+        pygame.K_m: lambda: on_vote("meh"),
+        pygame.K_b: lambda: on_vote("bad"),
+        pygame.K_RETURN: on_upload,
+    }
+
+    # Die Getter einmal beim Start prüfen (mit Log) statt jeden Frame das Zeichnen in
+    # try/except zu packen, das Fehler stumm verschluckt und einen leeren Screen hinterlässt
+    for name, cb in (("get_counts", get_counts), ("get_override_info", get_override_info),
+                     ("get_upload_info", get_upload_info), ("get_latest_sensor", get_latest_sensor)):
+        try:
+            cb()
+        except Exception:
+            _LOG.exception("ui: callback %s failed on startup check", name)
 
-    kind_to_big = {"good": big_good, "meh": big_meh, "bad": big_bad}
-    kind_to_small = {"good": small_good, "meh": small_meh, "bad": small_bad}
+    # pygame-Konstanten und -Funktionen, die jedes Wecken/Frame gebraucht werden, als Locals
+    QUIT, VIDEOEXPOSE, KEYDOWN = pygame.QUIT, pygame.VIDEOEXPOSE, pygame.KEYDOWN
+    event_wait = pygame.event.wait
+    event_get = pygame.event.get
+    display_flip = pygame.display.flip
+    display_update = pygame.display.update
+    monotonic = time.monotonic
 
     running = True
     while running:
-        now = time.time()
-        for evt in pygame.event.get():
-            if evt.type == pygame.QUIT:
+        events = [event_wait()]
+        events.extend(event_get())
+        now = monotonic()
+        for evt in events:
+            if evt.type == QUIT:
                 running = False
-            elif evt.type == pygame.KEYDOWN:
-                if evt.key == pygame.K_g:
-                    on_vote("good")
-                elif evt.key == pygame.K_m:
-                    on_vote("meh")
-                elif evt.key == pygame.K_b:
-                    on_vote("bad")
-                elif evt.key == pygame.K_RETURN:
-                    on_upload()
+            elif evt.type == VIDEOEXPOSE:
+                # Fensterinhalt verloren (z.B. verdeckt gewesen): nächstes Frame komplett
+                full_redraw = True
+                last_state = None
+            elif evt.type == KEYDOWN:
+                handler = key_handlers.get(evt.key)
+                if handler is not None:
+                    handler()
 
         # ----------------- MARKER:FUNC_FETCH -----------------
         # Functional block: fetch state from device. Move this whole block if you want to position
@@ -170,28 +392,27 @@ def run(get_counts,
         temp, db, co2, voc = _normalize_latest(latest)
         # ----------------- END MARKER:FUNC_FETCH -----------------
 
-        # Draw background
-        screen.fill((0,0,0))
-
-        # Draw mood scale (white line) above the big smiley
-        left_margin = 110
-        right_margin = screen.get_width() - 110
-        y = screen.get_height()//2 - 270
-
-        # ----------------- MARKER:LAYOUT_MOOD_SCALE -----------------
-        # Mood scale line and labels (you can move this whole block)
-        pygame.draw.line(screen, (255,255,255), (left_margin, y), (right_margin, y), 4)
-
-        try:
-            lbl_bad = sensor_font.render("Schlecht", True, (255,255,255))
-            lbl_meh = sensor_font.render("Neutral", True, (255,255,255))
-            lbl_good= sensor_font.render("Gut", True, (255,255,255))
-            screen.blit(lbl_bad,  ((left_margin - lbl_bad.get_width()//2) + 40, y + 12))
-            screen.blit(lbl_meh,  ((left_margin+right_margin)//2 - lbl_meh.get_width()//2, y + 12))
-            screen.blit(lbl_good, (right_margin - lbl_good.get_width()//2, y + 12))
-        except Exception:
-            pass
-        # ----------------- END MARKER:LAYOUT_MOOD_SCALE -----------------
+        # Sensorwerte gleich als Anzeigetext formatieren: der String ist quantisiert
+        # (22.41 und 22.38 -> "22.4 °C") und dient als Zustand und als Render-Cache-Key.
+        # Neue Messwerte kommen nur alle paar Sekunden: Texte nur dann neu bauen.
+        sensor = (temp, db, co2, voc)
+        if sensor != last_sensor:
+            temp_txt = "%.1f °C" % temp
+            db_txt = "%.1f dB" % db
+            co2_txt = "%d ppm" % co2
+            voc_txt = "%d ppb" % voc
+            last_sensor = sensor
+
+        # Ein Zeitpunkt pro Frame: Override und Upload-Hinweis einmal auswerten
+        override_active = (now - smiley_override_time) < SMILEY_OVERRIDE_DURATION and current_kind is not None
+        upload_failed_active = (now - upload_failed_time) < UPLOAD_FAILED_DURATION
+
+        # Prozente ändern sich nur mit den Stimmen (calculate_avg_smiley dagegen bleibt pro
+        # Frame: die Device-Seite lässt die angezeigte Art mit der Zeit rotieren)
+        counts = (good, meh, bad)
+        if counts != last_counts:
+            pct_counts = pct_round(good, meh, bad)
+            last_counts = counts
 
         # Calculate score for small smiley position
         total = good + meh + bad
@@ -200,158 +421,139 @@ def run(get_counts,
         else:
             # fallback: try to use EMA via calculate_avg_smiley which returns a kind
             kind_fallback, _ = calculate_avg_smiley(good, meh, bad)
-            if kind_fallback == "good":
-                score = 1.0
-            elif kind_fallback == "bad":
-                score = -1.0
-            else:
-                score = 0.0
-
-        frac = (score + 1.0) / 2.0
-        frac = max(0.0, min(1.0, frac))
-        sx = left_margin + frac * (right_margin - left_margin)
-
-        # choose small image by score segment
-        if score >= 0.33:
-            small_img = kind_to_small["good"]
-        elif score <= -0.33:
-            small_img = kind_to_small["bad"]
+            score = kind_to_score.get(kind_fallback, 0.0)
+
+        # score liegt immer in -1..1 ((good-bad)/total bzw. kind_to_score), kein Clamp nötig;
+        # sx ist die linke Kante des kleinen Smileys, einmal als int
+        sx = small_x0 + int((score + 1.0) * SLIDER_HALF_SPAN)
+
+        # choose small image by score segment (bools as 0/1: -1..1 -> index 0..2)
+        small_img = small_by_idx[(score >= 0.33) - (score <= -0.33) + 1]
+
+        # Now decide which big smiley to show (before the redraw check: the device's
+        # average kind rotates over time even when nothing else changes)
+        if override_active:
+            big_smiley = big_by_idx[KIND_IDX.get(current_kind, 1)]
+            pct_good, pct_meh, pct_bad = pct_counts
         else:
-            small_img = kind_to_small["meh"]
+            kind, (pct_good, pct_meh, pct_bad) = calculate_avg_smiley(good, meh, bad)
+            big_smiley = big_by_idx[KIND_IDX.get(kind, 1)]
 
-        sw, sh = small_img.get_size()
+        # Nur neu zeichnen, wenn sich etwas Sichtbares geändert hat. Override und
+        # Upload-Hinweis gehen als an/aus ein, damit ihr Ablaufen auch neu zeichnet.
+        state = (good, meh, bad, big_smiley, small_img, sx, override_active, upload_failed_active,
+                 temp_txt, db_txt, co2_txt, voc_txt)
+        if state == last_state:
+            continue
+        last_state = state
+
+        # Draw background (only where last frame's dynamic content was)
+        # ----------------- MARKER:LAYOUT_MOOD_SCALE -----------------
+        # Mood scale line and labels are part of the background surface
+        if full_redraw:
+            screen.blit(background, (0, 0))
+        else:
+            for r in prev_dirty:
+                screen.blit(background, r, r)
+        # ----------------- END MARKER:LAYOUT_MOOD_SCALE -----------------
+        dirty.clear()
 
         # ----------------- MARKER:LAYOUT_SMALL_SMILEY -----------------
         # Small smiley: position can be moved; copy this block if you want multiple small markers
-        screen.blit(small_img, (sx - sw//2, y - sh//2))
+        dirty.append(screen.blit(small_img, (sx, small_y)))
         # ----------------- END MARKER:LAYOUT_SMALL_SMILEY -----------------
 
-        # Now decide which big smiley to show:
-        now = time.time()
-        if (now - smiley_override_time) < SMILEY_OVERRIDE_DURATION and current_kind is not None:
-            big_smiley = kind_to_big.get(current_kind, kind_to_big["meh"])
-            pct_good, pct_meh, pct_bad = pct_round(good, meh, bad)
-        else:
-            kind, (pct_good, pct_meh, pct_bad) = calculate_avg_smiley(good, meh, bad)
-            big_smiley = kind_to_big.get(kind, kind_to_big["meh"])
-
         # ----------------- MARKER:LAYOUT_BIG_SMILEY -----------------
         # Big smiley block (centered). Move this block to change where the large smiley appears.
-        rect = big_smiley.get_rect(center=(screen.get_width()//2, screen.get_height()//2 - 50))
-        screen.blit(big_smiley, rect)
+        dirty.append(screen.blit(big_smiley, big_rect))
         # ----------------- END MARKER:LAYOUT_BIG_SMILEY -----------------
 
         # Write mood and sensor data side by side (minimal changes, mood colors kept).
-        base_x = 40
-        base_y = screen.get_height() - 150
-        try:
-            # Prepare mood lines (keep original colored values and percentages)
-            mood_lines = [
-                ("Gut:", str(good), (0,255,0), f"{pct_good}%"),
-                ("Neutral:", str(meh), (255,200,0), f"{pct_meh}%"),
-                ("Schlecht:", str(bad), (255,0,0), f"{pct_bad}%"),
-            ]
-
-            # Render mood surfaces and compute sizes
-            mood_label_surfs = []
-            mood_value_surfs = []
-            mood_pct_surfs = []
-            max_label_w = 0
-            max_value_w = 0
-            max_pct_w = 0
-            max_line_h = 0
-            for lbl, val, color, pct in mood_lines:
-                s_lbl = mood_font.render(f"{lbl}", True, (255,255,255))          # label white
-                s_val = mood_font.render(f"{val}", True, color)                # value colored
-                s_pct = mood_font.render(f" | {pct}", True, color)             # pct colored
-                mood_label_surfs.append(s_lbl)
-                mood_value_surfs.append(s_val)
-                mood_pct_surfs.append(s_pct)
-                max_label_w = max(max_label_w, s_lbl.get_width())
-                max_value_w = max(max_value_w, s_val.get_width())
-                max_pct_w = max(max_pct_w, s_pct.get_width())
-                max_line_h = max(max_line_h, s_lbl.get_height(), s_val.get_height(), s_pct.get_height())
-
-            mood_gap = 12
-            mood_block_width = max_label_w + mood_gap + max_value_w + mood_gap + max_pct_w
-
-            # Position mood block (same baseline as original)
-            mood_x = base_x
-            mood_y = base_y
-
-            # Draw mood block
-            for i in range(len(mood_lines)):
-                line_y = mood_y + i * (max_line_h + 8)
-                screen.blit(mood_label_surfs[i], (mood_x, line_y))
-                screen.blit(mood_value_surfs[i], (mood_x + max_label_w + mood_gap, line_y))
-                screen.blit(mood_pct_surfs[i], (mood_x + max_label_w + mood_gap + max_value_w + mood_gap, line_y))
-
-            # ----------------- MARKER:LAYOUT_SENSOR_BLOCK -----------------
-            # Sensor block: right-aligned; move this whole block if you want sensors elsewhere.
-            sensor_lines = [
-                ("Temperatur:", f"{temp:.1f} °C"),
-                ("Dezibel:", f"{db:.1f} dB"),
-                ("CO2:", f"{co2} ppm"),
-                ("VOC:", f"{voc} ppb"),
-            ]
-
-            sensor_label_surfs = []
-            sensor_value_surfs = []
-            max_sensor_label_w = 0
-            max_sensor_value_w = 0
-            max_sensor_line_h = 0
-            for lbl, val in sensor_lines:
-                s_lbl = sensor_font.render(lbl, True, (255,255,255))
-                s_val = sensor_font.render(val, True, (255,255,255))
-                sensor_label_surfs.append(s_lbl)
-                sensor_value_surfs.append(s_val)
-                max_sensor_label_w = max(max_sensor_label_w, s_lbl.get_width())
-                max_sensor_value_w = max(max_sensor_value_w, s_val.get_width())
-                max_sensor_line_h = max(max_sensor_line_h, s_lbl.get_height(), s_val.get_height())
-
-            sensor_block_width = max_sensor_label_w + 8 + max_sensor_value_w
-            max_allowed_sensor_x = screen.get_width() - sensor_block_width - 20
-
-            # Right-align the sensor block (user requested rechtsbündig).
-            sensor_x = max_allowed_sensor_x
-
-            # Compute total sensor block height and choose sensor_y higher to avoid VOC clipping.
-            line_spacing = max_sensor_line_h + 8
-            total_sensor_height = len(sensor_lines) * line_spacing
-
-            # Prefer to position sensors slightly above the mood block baseline so VOC (last line) stays visible.
-            desired_sensor_y = mood_y - 20  # move sensors a bit higher than mood baseline
-            sensor_y = min(desired_sensor_y, screen.get_height() - total_sensor_height - 20)
-            sensor_y = max(20, sensor_y)
-
-            # If right-aligned block overlaps mood block horizontally (no room), place sensors below mood block
-            if sensor_x < mood_x + mood_block_width + 8:
-                sensor_x = mood_x
-                sensor_y = mood_y + len(mood_lines) * (max_line_h + 8) + 12
-                if sensor_y + total_sensor_height + 20 > screen.get_height():
-                    sensor_y = max(20, screen.get_height() - total_sensor_height - 20)
-
-            # Draw sensor block stacked vertically (labels + values)
-            for i in range(len(sensor_lines)):
-                line_y = sensor_y + i * line_spacing
-                screen.blit(sensor_label_surfs[i], (sensor_x, line_y))
-                screen.blit(sensor_value_surfs[i], (sensor_x + max_sensor_label_w + 8, line_y))
-            # ----------------- END MARKER:LAYOUT_SENSOR_BLOCK -----------------
-
-        except Exception:
-            pass
+        # Render mood values/percentages (keep original colors); labels are pre-rendered
+        # in mood_label_surfs. Fixed 3 rows -> unrolled, no per-frame lists/loops.
+        val_good = _cached_render(mood_font, "%d" % good, GREEN)          # value colored
+        val_meh = _cached_render(mood_font, "%d" % meh, YELLOW)
+        val_bad = _cached_render(mood_font, "%d" % bad, RED)
+        pct_good_s = _cached_render(mood_font, " | %s%%" % pct_good, GREEN)  # pct colored
+        pct_meh_s = _cached_render(mood_font, " | %s%%" % pct_meh, YELLOW)
+        pct_bad_s = _cached_render(mood_font, " | %s%%" % pct_bad, RED)
+        max_value_w = max(val_good.get_width(), val_meh.get_width(), val_bad.get_width())
+        max_pct_w = max(pct_good_s.get_width(), pct_meh_s.get_width(), pct_bad_s.get_width())
+        max_line_h = max(max_label_h, val_good.get_height(), val_meh.get_height(), val_bad.get_height(),
+                         pct_good_s.get_height(), pct_meh_s.get_height(), pct_bad_s.get_height())
+
+        mood_block_width = max_label_w + MOOD_GAP + max_value_w + MOOD_GAP + max_pct_w
+
+        # Draw mood block
+        value_x = MOOD_X + max_label_w + MOOD_GAP
+        pct_x = value_x + max_value_w + MOOD_GAP
+        mood_step = max_line_h + 8
+        # one Surface.blits() call for all 9 mood surfaces (returns the rects for the dirty list);
+        # fixed 3 rows -> listed explicitly instead of a nested generator
+        meh_y = MOOD_Y + mood_step
+        bad_y = meh_y + mood_step
+        dirty.extend(screen.blits((
+            (mood_lbl_good, (MOOD_X, MOOD_Y)), (val_good, (value_x, MOOD_Y)), (pct_good_s, (pct_x, MOOD_Y)),
+            (mood_lbl_meh, (MOOD_X, meh_y)), (val_meh, (value_x, meh_y)), (pct_meh_s, (pct_x, meh_y)),
+            (mood_lbl_bad, (MOOD_X, bad_y)), (val_bad, (value_x, bad_y)), (pct_bad_s, (pct_x, bad_y)),
+        )))
+
+        # ----------------- MARKER:LAYOUT_SENSOR_BLOCK -----------------
+        # Sensor block: right-aligned; move this whole block if you want sensors elsewhere.
+        # Each row is label + value composed into one cached Surface (labels pre-rendered
+        # in sensor_label_surfs, values aligned at max_sensor_label_w + 8); fixed 4 rows.
+        row_temp = _cached_row(sensor_font, sensor_label_surfs[0], max_sensor_label_w, temp_txt, WHITE)
+        row_db = _cached_row(sensor_font, sensor_label_surfs[1], max_sensor_label_w, db_txt, WHITE)
+        row_co2 = _cached_row(sensor_font, sensor_label_surfs[2], max_sensor_label_w, co2_txt, WHITE)
+        row_voc = _cached_row(sensor_font, sensor_label_surfs[3], max_sensor_label_w, voc_txt, WHITE)
+        max_sensor_line_h = max(row_temp.get_height(), row_db.get_height(), row_co2.get_height(), row_voc.get_height())
+
+        sensor_block_width = max(row_temp.get_width(), row_db.get_width(), row_co2.get_width(), row_voc.get_width())
+        max_allowed_sensor_x = SW - sensor_block_width - 20
+
+        # Right-align the sensor block (user requested rechtsbündig).
+        sensor_x = max_allowed_sensor_x
+
+        # Compute total sensor block height and choose sensor_y higher to avoid VOC clipping.
+        line_spacing = max_sensor_line_h + 8
+        total_sensor_height = 4 * line_spacing
+
+        # Prefer to position sensors slightly above the mood block baseline so VOC (last line) stays visible.
+        sensor_y = min(SENSOR_Y_PREF, SH - total_sensor_height - 20)
+        sensor_y = max(20, sensor_y)
+
+        # If right-aligned block overlaps mood block horizontally (no room), place sensors below mood block
+        if sensor_x < MOOD_X + mood_block_width + 8:
+            sensor_x = MOOD_X
+            sensor_y = MOOD_Y + 3 * mood_step + 12
+            if sensor_y + total_sensor_height + 20 > SH:
+                sensor_y = max(20, SH - total_sensor_height - 20)
+
+        # Draw sensor block stacked vertically (label+value rows, one batched blits() call)
+        dirty.extend(screen.blits((
+            (row_temp, (sensor_x, sensor_y)),
+            (row_db, (sensor_x, sensor_y + line_spacing)),
+            (row_co2, (sensor_x, sensor_y + 2 * line_spacing)),
+            (row_voc, (sensor_x, sensor_y + 3 * line_spacing)),
+        )))
+        # ----------------- END MARKER:LAYOUT_SENSOR_BLOCK -----------------
 
         # ----------------- MARKER:UPLOAD_INDICATOR -----------------
         # Upload failed indicator (small block). Move this block if you want the message elsewhere.
-        if time.time() - upload_failed_time < UPLOAD_FAILED_DURATION:
-            try:
-                text = sensor_font.render("Upload fehlgeschlagen!", True, (255,50,50))
-                screen.blit(text, (screen.get_width()//2 - text.get_width()//2, 50))
-            except Exception:
-                pass
+        if upload_failed_active:
+            dirty.append(screen.blit(upload_failed_text, upload_failed_pos))
         # ----------------- END MARKER:UPLOAD_INDICATOR -----------------
 
-        pygame.display.flip()
-        clock.tick(30)
-
+        if full_redraw:
+            display_flip()
+            full_redraw = False
+        else:
+            # alte Positionen (gelöscht) + neue Positionen (gezeichnet), in-place angehängt
+            prev_dirty.extend(dirty)
+            display_update(prev_dirty)
+        # this frame's rects become next frame's prev_dirty; the other list is cleared and reused
+        prev_dirty, dirty = dirty, prev_dirty
+
+    pygame.time.set_timer(RENDER_TICK, 0)
+    _RENDER_CACHE.clear()
     pygame.quit()
\ No newline at end of file